@@ -1,19 +1,25 @@
 import streamlit as st
-import sys
+from streamlit.runtime.uploaded_file_manager import UploadedFile
 from pathlib import Path
+from types import MappingProxyType
 import tempfile
 import os
-from typing import Tuple, Optional
+import shutil
+import gc
+import threading
+import weakref
+from typing import List, Tuple, Optional
 import base64
-import matplotlib.font_manager as fm
-
-# Добавляем src в путь для импортов, чтобы модули находились корректно.
-sys.path.insert(0, str(Path(__file__).parent / "src"))
-
-# Импорты конфигураций и сервисов
-from src.services.composition_engine import CompositionEngine
-from src.services.export_service import ExportService
+import hashlib
+from functools import lru_cache, partial
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+# Импорты конфигураций. src — пакет, поэтому правка sys.path не нужна.
+# Сервисы (OpenCV, librosa) импортируются лениво там, где они используются,
+# чтобы не замедлять первый запуск скрипта.
 from src.utils.logger import setup_logger
+from src.utils.fonts import get_system_font_paths
 from src.models.meeting_config import MeetingConfig
 from src.models.speaker_config import SpeakerConfig
 from src.models.export_config import (
@@ -27,43 +33,28 @@ from src.models.export_config import (
 logger = setup_logger()
 
 
-def get_system_fonts():
-    """Возвращает список названий установленных в системе шрифтов."""
-    fonts = fm.findSystemFonts(fontpaths=None, fontext="ttf")
-    font_names = set()
-    for font in fonts:
-        try:
-            font_prop = fm.FontProperties(fname=font)
-            font_names.add(font_prop.get_name())
-        except Exception:
-            continue
-    return sorted(font_names)
-
-
-def get_font_path(font_name: str) -> str:
-    """
-    Возвращает путь к TTF файлу для выбранного шрифта.
-    Если не найден — возвращает стандартный Arial.
-    """
-    system_fonts = fm.findSystemFonts(fontpaths=None, fontext="ttf")
-    font_paths = {fm.FontProperties(fname=f).get_name(): f for f in system_fonts}
-
-    return font_paths.get(font_name, "arial.ttf")
+def get_system_fonts() -> Tuple[str, ...]:
+    """Возвращает отсортированный кортеж названий установленных в системе шрифтов."""
+    return tuple(sorted(get_system_font_paths()))
 
 
 # Вспомогательные функции (оставляем их вне класса, т.к. они утилитарны)
-def hex_to_rgb(hex_color: str) -> Tuple[int, ...]:
+# Цвета из color_picker повторяются от перезапуска к перезапуску,
+# поэтому результаты разбора кэшируются по строке.
+@lru_cache(maxsize=256)
+def hex_to_rgb(hex_color: str) -> Tuple[int, int, int]:
     """
     Конвертирует HEX цвет (например, '#FFFFFF') в кортеж RGB (255, 255, 255).
 
     :param hex_color: Строка с HEX кодом цвета, может начинаться с '#'.
     :return: Кортеж из трех целых чисел (R, G, B) от 0 до 255.
     """
-    # Удаляем символ '#' и преобразуем пары символов в десятичные числа.
-    hex_color = hex_color.lstrip("#")
-    return tuple(int(hex_color[i : i + 2], 16) for i in (0, 2, 4))
+    # bytes.fromhex разбирает пары hex-символов в C-цикле и проверяет их корректность.
+    red, green, blue = bytes.fromhex(hex_color.lstrip("#"))
+    return red, green, blue
 
 
+@lru_cache(maxsize=256)
 def hex_to_rgba(hex_color: str, alpha: int = 180) -> Tuple[int, int, int, int]:
     """
     Конвертирует HEX цвет в кортеж RGBA, используя заданное значение альфа-канала.
@@ -74,44 +65,235 @@ def hex_to_rgba(hex_color: str, alpha: int = 180) -> Tuple[int, int, int, int]:
     :return: Кортеж из четырех целых чисел (R, G, B, A).
     """
     # Для целей конфигурации оставляем alpha 0-255.
-    rgb = hex_to_rgb(hex_color)
-    return rgb[0], rgb[1], rgb[2], alpha
+    red, green, blue = hex_to_rgb(hex_color)
+    return red, green, blue, alpha
+
+
+# Жесткий лимит padding в модели SpeakerConfig
+PYDANTIC_PADDING_LIMIT = 50
+
+
+# Динамические границы ползунков зависят от пары значений из session_state и
+# нужны и виджетам, и сборке конфигурации, поэтому считаются в одном месте.
+@lru_cache(maxsize=64)
+def speaker_size_bounds(
+    output_width: int, output_height: int
+) -> Tuple[int, int, int, int]:
+    """
+    Границы размеров окна спикера: ширина от 10% до ~47% кадра,
+    высота от 10% до 60% кадра.
+
+    :param output_width: Ширина выходного видео.
+    :param output_height: Высота выходного видео.
+    :return: Кортеж (WIDTH_MIN, WIDTH_MAX, HEIGHT_MIN, HEIGHT_MAX).
+    """
+    return (
+        max(150, int(output_width * 0.1)),
+        int(output_width * 0.46875),
+        max(100, int(output_height * 0.1)),
+        int(output_height * 0.6),
+    )
+
+
+@lru_cache(maxsize=64)
+def font_size_bounds(speaker_height: int) -> Tuple[int, int]:
+    """
+    Границы размера шрифта: от 4% до 15% высоты окна спикера.
+
+    :param speaker_height: Высота окна спикера.
+    :return: Кортеж (FONT_SIZE_MIN, FONT_SIZE_MAX).
+    """
+    font_size_min = max(12, int(speaker_height * 0.04))
+    return font_size_min, max(font_size_min + 1, int(speaker_height * 0.15))
+
+
+@lru_cache(maxsize=64)
+def padding_bounds(output_height: int) -> Tuple[int, int]:
+    """
+    Границы отступа в плашке. Максимум ползунка ограничен PYDANTIC_PADDING_LIMIT.
+
+    :param output_height: Высота выходного видео.
+    :return: Кортеж (PADDING_MIN, SLIDER_PADDING_MAX).
+    """
+    padding_min = max(2, int(output_height * 0.01))
+    return padding_min, min(
+        PYDANTIC_PADDING_LIMIT, max(padding_min + 1, int(output_height * 0.08))
+    )
 
 
 def save_uploaded_file(uploaded_file, temp_dir: str) -> str:
     """
     Сохраняет загруженный через Streamlit файл во временную директорию.
 
+    Имя файла приходит от клиента, поэтому в путь попадает только его расширение
+    (по нему OpenCV и FFmpeg определяют формат): имя вида "../../x" не выведет
+    файл за пределы директории.
+
     :param uploaded_file: Объект загруженного файла из st.file_uploader.
     :param temp_dir: Путь к временной директории, куда нужно сохранить файл.
     :return: Полный путь к сохраненному файлу.
     """
-    file_path = os.path.join(temp_dir, uploaded_file.name)
-    with open(file_path, "wb") as f:
-        # getbuffer() возвращает содержимое файла в виде байтов.
-        f.write(uploaded_file.getbuffer())
+    file_path = os.path.join(temp_dir, "upload" + Path(uploaded_file.name).suffix)
+    uploaded_file.seek(0)
+    # Копируем блоками по 1 МиБ без буферизации Python: каждый блок уходит
+    # в файл одним системным вызовом write.
+    with open(file_path, "wb", buffering=0) as f:
+        shutil.copyfileobj(uploaded_file, f, length=1 << 20)
     return file_path
 
 
-def save_get_files(tmp_dir: str) -> Tuple[str, str, str]:
+class _SessionDir:
     """
-    Извлекает загруженные файлы из состояния сессии Streamlit, сохраняет их
-    во временную директорию и возвращает пути к ним.
+    Временная директория сессии Streamlit.
 
-    Предполагается, что файлы уже проверены на наличие функцией _validate_inputs.
+    Объект хранится в st.session_state: когда Streamlit закрывает сессию
+    и ее состояние удаляется сборщиком мусора, директория удаляется вместе
+    с загрузками и результатом экспорта. При завершении процесса
+    weakref.finalize удаляет оставшиеся директории.
 
-    :param tmp_dir: Путь к временной директории для сохранения.
-    :return: Кортеж из трех путей: (фон, видео спикера 1, видео спикера 2).
+    Директория создается в стандартном временном каталоге, а не в TEMP_ROOT:
+    загрузки и результат хранятся всю сессию, а память tmpfs оставлена
+    для короткоживущих промежуточных файлов кодирования.
+    """
+
+    def __init__(self):
+        self.path = tempfile.mkdtemp(prefix="vmc_")
+        weakref.finalize(self, shutil.rmtree, self.path, ignore_errors=True)
+
+
+def _get_session_dir() -> str:
+    """
+    Возвращает временную директорию текущей сессии Streamlit, создавая ее при
+    первом обращении. Директория удаляется по завершении сессии или процесса.
+
+    :return: Путь к директории сессии.
+    """
+    if "session_dir" not in st.session_state:
+        st.session_state.session_dir = _SessionDir()
+    return st.session_state.session_dir.path
+
+
+def get_saved_paths(*uploaded_files: UploadedFile) -> List[str]:
+    """
+    Возвращает пути к копиям загруженных файлов на диске.
+
+    Файл записывается один раз за сессию: предпросмотр и экспорт используют
+    одну и ту же копию, пока пользователь не загрузит другой файл.
+    Каждый файл хранится в своей поддиректории (по file_id), поэтому загрузки
+    с одинаковыми именами не перезаписывают друг друга.
+    Недостающие файлы записываются параллельно: запись на диск отпускает GIL.
+
+    :param uploaded_files: Объекты загруженных файлов из st.file_uploader.
+    :return: Полные пути к сохраненным файлам в том же порядке.
+    """
+    saved = st.session_state.setdefault("saved_uploads", {})
+    missing = [
+        uploaded_file
+        for uploaded_file in uploaded_files
+        if not os.path.exists(saved.get(uploaded_file.file_id) or "")
+    ]
+    if missing:
+        file_dirs = []
+        for uploaded_file in missing:
+            file_dir = os.path.join(_get_session_dir(), uploaded_file.file_id)
+            os.makedirs(file_dir, exist_ok=True)
+            file_dirs.append(file_dir)
+
+        # В рабочих потоках нет контекста Streamlit, поэтому st.session_state
+        # обновляется только здесь, после завершения записи.
+        with ThreadPoolExecutor(max_workers=len(missing)) as executor:
+            file_paths = list(executor.map(save_uploaded_file, missing, file_dirs))
+        for uploaded_file, file_path in zip(missing, file_paths):
+            saved[uploaded_file.file_id] = file_path
+
+    return [saved[uploaded_file.file_id] for uploaded_file in uploaded_files]
+
+
+def read_file_bytes(file_path: str) -> bytes:
+    """
+    Читает файл целиком. Используется как отложенный источник данных
+    для st.download_button.
+
+    :param file_path: Путь к файлу.
+    :return: Содержимое файла.
+    """
+    with open(file_path, "rb") as f:
+        return f.read()
+
+
+_gc_pause_lock = threading.Lock()
+_gc_pause_depth = 0
+
+
+@contextmanager
+def gc_paused():
+    """
+    Приостанавливает автоматическую сборку мусора Python на время композиции
+    кадра предпросмотра, чтобы сборки поколений не прерывали короткий участок
+    с большим числом временных объектов. Для экспорта не используется: он длится
+    минутами, а сборщик мусора общий для всего процесса.
+
+    Сборщик мусора общий для процесса, а сессии Streamlit работают в разных
+    потоках, поэтому ведется счетчик вложенности: сборка включается снова,
+    только когда завершилась последняя такая операция. Полная сборка после
+    операции не запускается: накопленные объекты соберет очередная
+    автоматическая сборка.
+    """
+    global _gc_pause_depth
+    with _gc_pause_lock:
+        if _gc_pause_depth == 0:
+            gc.disable()
+        _gc_pause_depth += 1
+    try:
+        yield
+    finally:
+        with _gc_pause_lock:
+            _gc_pause_depth -= 1
+            if _gc_pause_depth == 0:
+                gc.enable()
+
+
+def prune_saved_uploads():
+    """
+    Удаляет с диска копии файлов, которые больше не загружены в сессии
+    (пользователь удалил или заменил файл в st.file_uploader),
+    и забывает их хеши.
+    """
+    saved = st.session_state.get("saved_uploads", {})
+    hashes = st.session_state.get("upload_hashes", {})
+    if not saved and not hashes:
+        return
+    active_ids = {
+        uploaded_file.file_id
+        for uploaded_file in (
+            st.session_state.get("background_file"),
+            st.session_state.get("speaker1_file"),
+            st.session_state.get("speaker2_file"),
+        )
+        if uploaded_file is not None
+    }
+    for file_id in list(saved):
+        if file_id not in active_ids:
+            shutil.rmtree(os.path.dirname(saved.pop(file_id)), ignore_errors=True)
+    for file_id in list(hashes):
+        if file_id not in active_ids:
+            del hashes[file_id]
+
+
+def save_get_files() -> Tuple[str, str, str]:
     """
-    background_file = st.session_state.get("background_file")
-    speaker1_file = st.session_state.get("speaker1_file")
-    speaker2_file = st.session_state.get("speaker2_file")
+    Извлекает загруженные файлы из состояния сессии Streamlit и возвращает
+    пути к их копиям на диске (см. get_saved_paths).
 
-    # Сохраняем загруженные файлы
-    background_path = save_uploaded_file(background_file, tmp_dir)
-    speaker1_path = save_uploaded_file(speaker1_file, tmp_dir)
-    speaker2_path = save_uploaded_file(speaker2_file, tmp_dir)
+    Предполагается, что файлы уже проверены на наличие функцией _validate_inputs.
 
+    :return: Кортеж из трех путей: (фон, видео спикера 1, видео спикера 2).
+    """
+    background_path, speaker1_path, speaker2_path = get_saved_paths(
+        st.session_state.background_file,
+        st.session_state.speaker1_file,
+        st.session_state.speaker2_file,
+    )
     return background_path, speaker1_path, speaker2_path
 
 
@@ -135,6 +317,412 @@ def _validate_inputs() -> bool:
     )
 
 
+@lru_cache(maxsize=64)
+def build_config_objects(
+    speaker_width: int,
+    speaker_height: int,
+    font_size: int,
+    font_color: Tuple[int, int, int],
+    plate_bg_color: Tuple[int, int, int, int],
+    plate_border_color: Tuple[int, int, int],
+    plate_border_width: int,
+    plate_padding: int,
+    font_family: str,
+    plate_render_backend: str,
+    output_width: int,
+    output_height: int,
+    fps: int,
+    video_codec: str,
+    ffmpeg_preset: str,
+    ffmpeg_crf: int,
+    use_gpu: bool,
+) -> Tuple[SpeakerConfig, ExportConfig]:
+    """
+    Создает конфигурации спикеров и экспорта из примитивных значений настроек.
+
+    Результат кэшируется: при перезапуске скрипта с теми же настройками
+    модели Pydantic не создаются и не валидируются заново. Возвращаемые объекты
+    общие, поэтому изменять их нельзя — для изменений используйте model_copy().
+
+    :return: Кортеж (SpeakerConfig, ExportConfig).
+    """
+    speaker_config = SpeakerConfig(
+        width=speaker_width,
+        height=speaker_height,
+        position=None,
+        font_size=font_size,
+        font_color=font_color,
+        plate_bg_color=plate_bg_color,
+        plate_border_color=plate_border_color,
+        plate_border_width=plate_border_width,
+        plate_padding=plate_padding,
+        font_family=font_family,
+        render_backend=plate_render_backend,
+    )
+    export_config = ExportConfig(
+        width=output_width,
+        height=output_height,
+        fps=fps,
+        video_codec=VideoCodecConfig(
+            codec=video_codec, preset=ffmpeg_preset, crf=ffmpeg_crf
+        ),
+        audio_codec=AudioCodecConfig(),
+        gpu_config=GPUConfig(use_gpu=use_gpu),
+    )
+    return speaker_config, export_config
+
+
+_SERVICES_IMPORT_LOCK = threading.Lock()
+
+
+def _import_services():
+    """
+    Импортирует пакет сервисов (OpenCV, librosa, matplotlib) при первом обращении.
+
+    Пакет импортируют и фоновый прогрев, и основной поток. Одновременный импорт
+    из двух потоков может отдать одному из них частично инициализированный
+    модуль, поэтому импорт выполняется под общей блокировкой.
+
+    :return: Модуль src.services.
+    """
+    with _SERVICES_IMPORT_LOCK:
+        import src.services
+
+    return src.services
+
+
+@st.cache_resource(max_entries=8)
+def get_composition_engine(speaker_config: SpeakerConfig, export_config: ExportConfig):
+    """
+    Возвращает движок композиции, общий для всех перезапусков скрипта.
+
+    Экземпляр на набор конфигураций общий для всех сессий: его используют
+    предпросмотр и экспорт из разных потоков. Движок хранит только готовые
+    плашки по имени спикера, а они зависят лишь от имени и конфигурации.
+
+    :param speaker_config: Конфигурация окон спикеров и плашек.
+    :param export_config: Конфигурация выходного кадра.
+    :return: Экземпляр CompositionEngine.
+    """
+    return _import_services().CompositionEngine(speaker_config, export_config)
+
+
+@st.cache_resource(max_entries=8)
+def get_export_service(export_config: ExportConfig):
+    """
+    Возвращает сервис экспорта, общий для всех перезапусков скрипта.
+
+    ExportService при создании записывает найденный GPU кодек в конфигурацию,
+    поэтому получает копию, а не общий объект из кэша конфигураций.
+
+    :param export_config: Конфигурация экспорта.
+    :return: Экземпляр ExportService.
+    """
+    return _import_services().ExportService(export_config.model_copy(deep=True))
+
+
+def _warm_up_services():
+    """
+    Импортирует сервисы композиции и экспорта, проверяет доступные GPU кодеки
+    и строит список системных шрифтов.
+
+    Выполняется в фоновом потоке, пока пользователь загружает файлы: к первому
+    предпросмотру OpenCV и librosa уже импортированы, к первому экспорту
+    результат проверки FFmpeg уже в кэше, а вкладка «Плашки» открывается
+    без обхода каталогов шрифтов (и без построения кэша шрифтов matplotlib
+    на первом запуске в контейнере).
+    """
+    try:
+        export_service = _import_services().export_service
+        export_service.detect_gpu_codec()
+        export_service.list_available_video_codecs()
+        get_system_font_paths()
+    except Exception as e:
+        logger.warning(f"Ошибка фонового прогрева сервисов: {e}")
+
+
+@st.cache_resource
+def start_warm_up() -> threading.Thread:
+    """
+    Запускает прогрев сервисов один раз на процесс Streamlit.
+
+    :return: Фоновый поток прогрева.
+    """
+    thread = threading.Thread(target=_warm_up_services, name="warm-up", daemon=True)
+    thread.start()
+    return thread
+
+
+# Сколько экспортов может выполняться одновременно во всех сессиях. FFmpeg и так
+# занимает все ядра, поэтому лишние параллельные экспорты только замедляют друг друга.
+MAX_CONCURRENT_EXPORTS = 2
+
+
+@st.cache_resource
+def get_export_slots() -> threading.BoundedSemaphore:
+    """
+    Возвращает общий для процесса семафор, ограничивающий число одновременных
+    экспортов. Экспорт сверх лимита ждет освобождения слота.
+
+    :return: Семафор на MAX_CONCURRENT_EXPORTS слотов.
+    """
+    return threading.BoundedSemaphore(MAX_CONCURRENT_EXPORTS)
+
+
+# Названия кодеков для выбора в UI
+VIDEO_CODEC_LABELS = {
+    "libx264": "H.264 (авто: GPU, если доступен, иначе libx264)",
+    "libx265": "H.265 (авто: NVENC, если доступен, иначе libx265)",
+    "h264_nvenc": "H.264 (NVIDIA NVENC)",
+    "hevc_nvenc": "H.265 (NVIDIA NVENC)",
+    "h264_amf": "H.264 (AMD AMF)",
+    "h264_qsv": "H.264 (Intel QSV)",
+    "h264_vaapi": "H.264 (VAAPI)",
+}
+
+
+def get_available_video_codecs() -> Tuple[str, ...]:
+    """
+    Возвращает кодеки, доступные для экспорта на этой машине.
+    Проверка FFmpeg выполняется один раз на процесс (см. ExportService).
+
+    :return: Кортеж имен кодеков FFmpeg.
+    """
+    return _import_services().export_service.list_available_video_codecs()
+
+
+# Изображение-заглушка для области предпросмотра
+PLACEHOLDER_PATH = Path(__file__).parent / "public" / "plug.png"
+
+
+@lru_cache(maxsize=1)
+def get_placeholder_data_uri() -> Optional[str]:
+    """
+    Возвращает заглушку предпросмотра в виде data URI (base64).
+    Файл читается и кодируется один раз на процесс, а не при каждом перезапуске.
+
+    :return: Строка data URI или None, если файл заглушки не найден.
+    """
+    if not PLACEHOLDER_PATH.exists():
+        return None
+    with open(PLACEHOLDER_PATH, "rb") as image_file:
+        encoded = base64.b64encode(image_file.read()).decode()
+    return f"data:image/png;base64,{encoded}"
+
+
+# Разметка заглушки предпросмотра; подставляется только data URI изображения
+PLACEHOLDER_HTML_TEMPLATE = """
+<div style="display: flex; flex-direction: column; align-items: center; justify-content: center; height: 450px; background: rgba(0,0,0,0);">
+    <img src="{uri}" alt="Preview" style="height: 120px;" />
+    <div style="margin-top: 16px; color: #888; font-size: 1.1rem;">Предпросмотр будет здесь</div>
+</div>
+"""
+
+
+@lru_cache(maxsize=1)
+def get_placeholder_html() -> Optional[str]:
+    """
+    Возвращает готовую HTML разметку заглушки предпросмотра.
+    Строка собирается один раз на процесс.
+
+    :return: HTML строка или None, если файл заглушки не найден.
+    """
+    placeholder_uri = get_placeholder_data_uri()
+    if placeholder_uri is None:
+        return None
+    return PLACEHOLDER_HTML_TEMPLATE.format(uri=placeholder_uri)
+
+
+# Максимальная ширина кадра предпросмотра. Предпросмотр показывается в колонке
+# шириной ~1000 px, поэтому компоновать его в полном разрешении (вплоть до 4K) незачем.
+PREVIEW_MAX_WIDTH = 1280
+
+
+def _scale_speaker_config(speaker_config: SpeakerConfig, scale: float) -> SpeakerConfig:
+    """
+    Масштабирует размеры окон и плашек спикеров, сохраняя раскладку кадра.
+
+    :param speaker_config: Исходная конфигурация спикеров.
+    :param scale: Коэффициент масштабирования (0 < scale <= 1).
+    :return: Копия конфигурации с уменьшенными размерами.
+    """
+    border_width = speaker_config.plate_border_width
+    return speaker_config.model_copy(
+        update={
+            "width": max(1, round(speaker_config.width * scale)),
+            "height": max(1, round(speaker_config.height * scale)),
+            "font_size": max(1, round(speaker_config.font_size * scale)),
+            "plate_padding": round(speaker_config.plate_padding * scale),
+            # Тонкая рамка не должна исчезать при уменьшении
+            "plate_border_width": max(1, round(border_width * scale))
+            if border_width
+            else 0,
+        }
+    )
+
+
+def _hash_uploaded_file(uploaded_file: UploadedFile) -> str:
+    """
+    Ключ кэша для загруженного файла: хеш его содержимого.
+    Один и тот же файл дает один ключ независимо от объекта UploadedFile.
+
+    Содержимое загрузки с данным file_id не меняется, поэтому хеш считается
+    один раз на файл и хранится в состоянии сессии: при перезапусках скрипта
+    многомегабайтные видео повторно не хешируются.
+
+    :param uploaded_file: Объект загруженного файла из st.file_uploader.
+    :return: BLAKE2b (128 бит) содержимого в виде hex-строки.
+    """
+    hashes = st.session_state.setdefault("upload_hashes", {})
+    file_hash = hashes.get(uploaded_file.file_id)
+    if file_hash is None:
+        # getbuffer() отдает memoryview без копирования содержимого
+        file_hash = hashlib.blake2b(
+            uploaded_file.getbuffer(), digest_size=16
+        ).hexdigest()
+        hashes[uploaded_file.file_id] = file_hash
+    return file_hash
+
+
+@st.cache_resource(max_entries=4, hash_funcs={UploadedFile: _hash_uploaded_file})
+def decode_background(background_file: UploadedFile):
+    """
+    Декодирует загруженное фоновое изображение один раз на содержимое файла.
+
+    При изменении настроек, влияющих на кадр, предпросмотр пересчитывается,
+    но фон повторно не декодируется. Массив общий и доступен только для чтения.
+
+    :param background_file: Загруженное фоновое изображение.
+    :return: Изображение (BGR numpy array) или None в случае ошибки.
+    """
+    background = _import_services().ImageProcessor.decode_image(
+        background_file.getbuffer()
+    )
+    if background is not None:
+        background.flags.writeable = False
+    return background
+
+
+@st.cache_resource(max_entries=4, hash_funcs={UploadedFile: _hash_uploaded_file})
+def get_preview_background(background_file: UploadedFile, width: int, height: int):
+    """
+    Возвращает фон, масштабированный до разрешения предпросмотра.
+
+    Разрешение предпросмотра зависит только от разрешения экспорта, а движок
+    композиции создается заново при каждом изменении плашек или окон, поэтому
+    масштабированный фон кэшируется здесь, на пару (файл, разрешение).
+
+    :param background_file: Загруженное фоновое изображение.
+    :param width: Ширина кадра предпросмотра.
+    :param height: Высота кадра предпросмотра.
+    :return: Изображение (BGR numpy array, только для чтения) или None.
+    """
+    background = decode_background(background_file)
+    if background is None:
+        return None
+    background = _import_services().VideoProcessor.resize_frame(
+        background, width, height
+    )
+    background.flags.writeable = False
+    return background
+
+
+# JPEG возвращается как неизменяемый объект bytes, поэтому кэш ресурсов отдает его
+# без копирования; st.cache_data сериализовал бы и копировал его на каждом попадании.
+@st.cache_resource(
+    max_entries=32, show_spinner=False, hash_funcs={UploadedFile: _hash_uploaded_file}
+)
+def create_preview_image(
+    background_file: UploadedFile,
+    speaker1_file: UploadedFile,
+    speaker2_file: UploadedFile,
+    speaker1_name: str,
+    speaker2_name: str,
+    speaker_config: SpeakerConfig,
+    output_width: int,
+    output_height: int,
+) -> Optional[bytes]:
+    """
+    Создает предпросмотр композиции в виде изображения (JPEG).
+
+    Функция объявлена на уровне модуля и получает все входные данные аргументами,
+    поэтому кэш Streamlit пересчитывается только при изменении файлов
+    (по содержимому) или параметров, влияющих на кадр. FPS и параметры кодека
+    на предпросмотр не влияют и в ключ кэша не входят.
+
+    :param background_file: Загруженное фоновое изображение.
+    :param speaker1_file: Загруженное видео первого спикера.
+    :param speaker2_file: Загруженное видео второго спикера.
+    :param speaker1_name: Имя первого спикера.
+    :param speaker2_name: Имя второго спикера.
+    :param speaker_config: Конфигурация окон спикеров и плашек.
+    :param output_width: Ширина итогового кадра.
+    :param output_height: Высота итогового кадра.
+    :return: Байтовое представление изображения JPEG, или None в случае ошибки.
+    """
+    # Кадр компонуется в уменьшенном разрешении, пропорционально уменьшаются
+    # окна спикеров и плашки, так что раскладка совпадает с итоговым видео.
+    scale = min(1.0, PREVIEW_MAX_WIDTH / output_width)
+    if scale < 1.0:
+        speaker_config = _scale_speaker_config(speaker_config, scale)
+    export_config = ExportConfig(
+        width=max(1, round(output_width * scale)),
+        height=max(1, round(output_height * scale)),
+    )
+
+    try:
+        composition_engine = get_composition_engine(speaker_config, export_config)
+
+        # Фон декодируется прямо из буфера загрузки и масштабируется до размера
+        # предпросмотра (один раз на содержимое и разрешение).
+        # Видео OpenCV читает по пути, поэтому берем их копии сессии.
+        background = get_preview_background(
+            background_file, export_config.width, export_config.height
+        )
+        if background is None:
+            return None
+        speaker1_path, speaker2_path = get_saved_paths(speaker1_file, speaker2_file)
+
+        # Кадр компонуется и кодируется в JPEG в памяти
+        with gc_paused():
+            preview_frame = composition_engine.compose_preview_frame(
+                background, speaker1_path, speaker2_path, speaker1_name, speaker2_name
+            )
+            if preview_frame is None:
+                return None
+            return composition_engine.image_processor.encode_jpeg(preview_frame)
+
+    except Exception as e:
+        logger.error(f"Ошибка создания предпросмотра: {e}")
+        return None
+
+
+# Значения настроек по умолчанию (только для чтения)
+DEFAULT_STATE = MappingProxyType(
+    {
+        "speaker1_name": "Спикер 1",
+        "speaker2_name": "Спикер 2",
+        "speaker_width": 400,
+        "speaker_height": 300,
+        "manual_font_size": 24,
+        "font_color": "#FFFFFF",
+        "plate_bg_color": "#000000",
+        "plate_border_color": "#FFFFFF",
+        "plate_border_width": 2,
+        "plate_padding": 30,
+        "output_width": 1920,
+        "output_height": 1080,
+        "fps": 30,
+        "video_codec": "libx264",
+        "ffmpeg_preset": "faster",
+        "ffmpeg_crf": 23,
+        "use_gpu": True,
+        "font_family": "Arial",
+        "plate_render_backend": "pil",
+    }
+)
+
+
 class VideoMeetingComposerApp:
     """
     Класс Streamlit приложения для композиции видеоконференций.
@@ -156,48 +744,28 @@ class VideoMeetingComposerApp:
 
     @staticmethod
     def _init_session_state():
-        default_state = {
-            "speaker1_name": "Спикер 1",
-            "speaker2_name": "Спикер 2",
-            "speaker_width": 400,
-            "speaker_height": 300,
-            "manual_font_size": 24,
-            "font_color": "#FFFFFF",
-            "plate_bg_color": "#000000",
-            "plate_border_color": "#FFFFFF",
-            "plate_border_width": 2,
-            "plate_padding": 30,
-            "output_width": 1920,
-            "output_height": 1080,
-            "fps": 30,
-            "ffmpeg_preset": "fast",
-            "ffmpeg_crf": 23,
-            "use_gpu": True,
-            "font_family": "Arial",
-        }
-        for key, value in default_state.items():
-            if key not in st.session_state:
-                st.session_state[key] = value
+        # Значения переприсваиваются на каждом перезапуске: Streamlit удаляет
+        # состояние виджетов, которые не были отрисованы (неактивные вкладки
+        # настроек), и без этого настройки сбрасывались бы к значениям по умолчанию.
+        # Поэтому setdefault здесь не подходит.
+        for key, value in DEFAULT_STATE.items():
+            st.session_state[key] = st.session_state.get(key, value)
 
     def _get_config_objects(self) -> Tuple[SpeakerConfig, ExportConfig]:
         output_height = st.session_state.output_height
         speaker_height = st.session_state.speaker_height
-        FONT_SIZE_MIN = max(12, int(speaker_height * 0.04))
-        FONT_SIZE_MAX = max(FONT_SIZE_MIN + 1, int(speaker_height * 0.15))
+        FONT_SIZE_MIN, FONT_SIZE_MAX = font_size_bounds(speaker_height)
         user_font_size = st.session_state.manual_font_size
         dynamic_font_size = max(FONT_SIZE_MIN, min(FONT_SIZE_MAX, user_font_size))
         user_font_name = st.session_state.font_family
-        # user_font_path = get_font_path(user_font_name)
-        PADDING_MIN = max(2, int(output_height * 0.01))
-        PYDANTIC_PADDING_LIMIT = 50
+        PADDING_MIN, _ = padding_bounds(output_height)
         user_plate_padding = st.session_state.plate_padding
         dynamic_plate_padding = max(
             PADDING_MIN, min(PYDANTIC_PADDING_LIMIT, user_plate_padding)
         )
-        speaker_config = SpeakerConfig(
-            width=st.session_state.speaker_width,
-            height=st.session_state.speaker_height,
-            position=None,
+        return build_config_objects(
+            speaker_width=st.session_state.speaker_width,
+            speaker_height=speaker_height,
             font_size=dynamic_font_size,
             font_color=hex_to_rgb(st.session_state.font_color),
             plate_bg_color=hex_to_rgba(st.session_state.plate_bg_color),
@@ -205,19 +773,15 @@ class VideoMeetingComposerApp:
             plate_border_width=st.session_state.plate_border_width,
             plate_padding=dynamic_plate_padding,
             font_family=user_font_name,
-        )
-        export_config = ExportConfig(
-            width=st.session_state.output_width,
-            height=st.session_state.output_height,
+            plate_render_backend=st.session_state.plate_render_backend,
+            output_width=st.session_state.output_width,
+            output_height=output_height,
             fps=st.session_state.fps,
-            video_codec=VideoCodecConfig(
-                preset=st.session_state.ffmpeg_preset,
-                crf=st.session_state.ffmpeg_crf,
-            ),
-            audio_codec=AudioCodecConfig(),
-            gpu_config=GPUConfig(use_gpu=st.session_state.use_gpu),
+            video_codec=st.session_state.video_codec,
+            ffmpeg_preset=st.session_state.ffmpeg_preset,
+            ffmpeg_crf=st.session_state.ffmpeg_crf,
+            use_gpu=st.session_state.use_gpu,
         )
-        return speaker_config, export_config
 
     # --- Секции Рендеринга ---
 
@@ -258,13 +822,10 @@ class VideoMeetingComposerApp:
         output_width = st.session_state.output_width
         output_height = st.session_state.output_height
 
-        # Динамические границы для ширины (от 10% до ~47% кадра)
-        WIDTH_MIN = max(150, int(output_width * 0.1))
-        WIDTH_MAX = int(output_width * 0.46875)
-
-        # Динамические границы для высоты (от 10% до 60% кадра)
-        HEIGHT_MIN = max(100, int(output_height * 0.1))
-        HEIGHT_MAX = int(output_height * 0.6)
+        # Динамические границы (ширина от 10% до ~47% кадра, высота от 10% до 60%)
+        WIDTH_MIN, WIDTH_MAX, HEIGHT_MIN, HEIGHT_MAX = speaker_size_bounds(
+            output_width, output_height
+        )
 
         st.info(f"""
             Границы размеров окон динамически масштабируются относительно разрешения экспорта ({output_width}x{output_height}):
@@ -301,8 +862,7 @@ class VideoMeetingComposerApp:
         speaker_height = st.session_state.speaker_height
 
         # Динамические границы размера шрифта (от 4% до 15% высоты окна спикера)
-        FONT_SIZE_MIN = max(12, int(speaker_height * 0.04))
-        FONT_SIZE_MAX = max(FONT_SIZE_MIN + 1, int(speaker_height * 0.15))
+        FONT_SIZE_MIN, FONT_SIZE_MAX = font_size_bounds(speaker_height)
 
         # Ползунок для размера шрифта
         st.slider(
@@ -332,6 +892,19 @@ class VideoMeetingComposerApp:
 
         st.color_picker("Цвет текста", key="font_color", help="Цвет текста на плашках")
 
+        st.radio(
+            "Отрисовка плашек",
+            options=["pil", "opencv"],
+            format_func=lambda backend: {
+                "pil": "PIL (выбранный шрифт)",
+                "opencv": "OpenCV (быстрее, только латиница)",
+            }[backend],
+            key="plate_render_backend",
+            horizontal=True,
+            help="OpenCV рисует плашки встроенным шрифтом без PIL. Имена не на "
+            "латинице все равно рисуются через PIL выбранным шрифтом.",
+        )
+
         st.subheader("🎨 Фон плашки")
         st.color_picker("Цвет фона", key="plate_bg_color", help="Цвет фона плашки")
         st.color_picker(
@@ -347,14 +920,8 @@ class VideoMeetingComposerApp:
         )
 
         # ---------------------------------------------------------------------
-        # ЖЕСТКИЙ ЛИМИТ ДЛЯ PADDING (PYDANTIC)
-        PYDANTIC_PADDING_LIMIT = 50
-        PADDING_MIN = max(2, int(output_height * 0.01))
-
         # Максимальное значение, доступное в UI, ограничено 50px (для Pydantic)
-        SLIDER_PADDING_MAX = min(
-            PYDANTIC_PADDING_LIMIT, max(PADDING_MIN + 1, int(output_height * 0.08))
-        )
+        PADDING_MIN, SLIDER_PADDING_MAX = padding_bounds(output_height)
 
         # Новый ползунок для padding
         st.slider(
@@ -400,6 +967,16 @@ class VideoMeetingComposerApp:
         )
 
         st.subheader("⚡ Оптимизация")
+        st.selectbox(
+            "Кодек",
+            options=get_available_video_codecs(),
+            format_func=lambda codec: VIDEO_CODEC_LABELS.get(codec, codec),
+            key="video_codec",
+            help="Аппаратные кодеки (NVENC, AMF, QSV) показываются, только если "
+            "они работают на этой машине. Кодирование на GPU в разы быстрее CPU. "
+            "H.264 (авто) использует найденный GPU кодек, H.265 (авто) — только "
+            "hevc_nvenc; формат видео при этом не меняется.",
+        )
         st.selectbox(
             "Пресет FFmpeg",
             options=["ultrafast", "superfast", "veryfast", "faster", "fast", "medium"],
@@ -418,17 +995,39 @@ class VideoMeetingComposerApp:
     def _render_settings_section(self):
         """Рендерит секцию настроек с вкладками."""
         st.header("⚙️ Настройки")
+        # on_change="rerun" включает ленивые вкладки: tab.open истинно только
+        # для выбранной вкладки, и виджеты остальных вкладок не создаются.
         tab_upload, tab1, tab2, tab3 = st.tabs(
-            ["⬆️ Загрузка файлов", "🎤 Спикеры", "🎨 Плашки", "📤 Экспорт"]
+            ["⬆️ Загрузка файлов", "🎤 Спикеры", "🎨 Плашки", "📤 Экспорт"],
+            key="settings_tab",
+            on_change="rerun",
         )
+        # Загрузки и настройки собраны в формы: изменения применяются по кнопке,
+        # а не на каждое движение ползунка или правку имени, поэтому предпросмотр
+        # не пересчитывается на промежуточных значениях.
         with tab_upload:
-            self._render_upload_tab()
-        with tab1:
-            self._render_speaker_settings()
-        with tab2:
-            self._render_plate_settings()
-        with tab3:
-            self._render_export_settings()
+            # Вкладка загрузки отрисовывается всегда: значение st.file_uploader
+            # нельзя восстановить через session_state, и без виджета файлы пропали бы.
+            with st.form("uploads", border=False):
+                self._render_upload_tab()
+                self._render_apply_button()
+        if tab1.open:
+            with tab1, st.form("speaker_settings", border=False):
+                self._render_speaker_settings()
+                self._render_apply_button()
+        if tab2.open:
+            with tab2, st.form("plate_settings", border=False):
+                self._render_plate_settings()
+                self._render_apply_button()
+        if tab3.open:
+            with tab3, st.form("export_settings", border=False):
+                self._render_export_settings()
+                self._render_apply_button()
+
+    @staticmethod
+    def _render_apply_button():
+        """Отображает кнопку применения настроек формы."""
+        st.form_submit_button("✅ Применить", type="primary", width="stretch")
 
     def _render_preview_section(self):
         """Рендерит секцию предпросмотра, включая вызов кэшированной функции для генерации."""
@@ -439,9 +1038,18 @@ class VideoMeetingComposerApp:
 
         if _validate_inputs():
             with st.spinner("🔄 Генерация предпросмотра..."):
-                # Передаем хеш состояния, чтобы Streamlit знал, когда нужно пересчитать кэш
-                state_hash = self._get_state_hash_for_caching()
-                preview_image = self._create_preview_cached(state_hash)
+                speaker_config, export_config = self._get_config_objects()
+                # Кэш учитывает содержимое файлов и все параметры, влияющие на кадр
+                preview_image = create_preview_image(
+                    st.session_state.background_file,
+                    st.session_state.speaker1_file,
+                    st.session_state.speaker2_file,
+                    st.session_state.speaker1_name,
+                    st.session_state.speaker2_name,
+                    speaker_config,
+                    export_config.width,
+                    export_config.height,
+                )
 
                 if preview_image:
                     preview_placeholder.image(
@@ -467,118 +1075,24 @@ class VideoMeetingComposerApp:
         """
         Отображает информационное сообщение и стилизованную заглушку
         на месте предпросмотра, если файлы еще не загружены.
-        Использует base64 кодирование для встраивания изображения заглушки.
+        Разметка с изображением в base64 собирается один раз (get_placeholder_html).
         """
         st.info("📋 Загрузите все файлы для отображения предпросмотра")
-        # Использование заглушки из файла (предполагается, что plug.png существует)
         try:
-            # Динамическое определение пути к заглушке
-            base_dir = Path(__file__).parent
-            plug_path = base_dir / "public" / "plug.png"
-
-            # Проверка наличия файла
-            if not plug_path.exists():
+            placeholder_html = get_placeholder_html()
+            if placeholder_html is None:
                 st.warning(
-                    f"Файл '{plug_path}' не найден. Невозможно отобразить заглушку."
+                    f"Файл '{PLACEHOLDER_PATH}' не найден. Невозможно отобразить заглушку."
                 )
                 return
 
-            with open(plug_path, "rb") as image_file:
-                encoded = base64.b64encode(image_file.read()).decode()
-            st.markdown(
-                f"""
-                <div style="display: flex; flex-direction: column; align-items: center; justify-content: center; height: 450px; background: rgba(0,0,0,0);">
-                    <img src="data:image/png;base64,{encoded}" alt="Preview" style="height: 120px;" />
-                    <div style="margin-top: 16px; color: #888; font-size: 1.1rem;">Предпросмотр будет здесь</div>
-                </div>
-                """,
-                unsafe_allow_html=True,
-            )
+            st.markdown(placeholder_html, unsafe_allow_html=True)
         except Exception as e:
             # Логирование ошибки при чтении или встраивании заглушки
             st.warning(f"Ошибка при отображении заглушки: {e}")
 
-    @st.cache_data
-    def _create_preview_cached(_self, state_hash: int) -> Optional[bytes]:
-        """
-        Создает предпросмотр композиции в виде изображения (JPEG).
-        Функция кэшируется Streamlit: она выполнится только при изменении state_hash.
-
-        :param _self: Ссылка на экземпляр класса (требуется для доступа к методам _self).
-        :param state_hash: Хеш, представляющий все настройки, влияющие на предпросмотр.
-        :return: Байтовое представление изображения JPEG, или None в случае ошибки.
-        """
-        # Получаем конфигурацию из сессии, используя _self
-        speaker_config, export_config = _self._get_config_objects()
-
-        try:
-            # Используем временную директорию для сохранения файлов и предпросмотра
-            with tempfile.TemporaryDirectory() as temp_dir:
-                # Сохраняем загруженные файлы в temp_dir
-                background_path, speaker1_path, speaker2_path = save_get_files(temp_dir)
-
-                composition_engine = CompositionEngine(speaker_config, export_config)
-
-                preview_path = os.path.join(temp_dir, "preview.jpg")
-                # Вызываем движок композиции для создания превью
-                success = composition_engine.create_preview(
-                    background_path,
-                    speaker1_path,
-                    speaker2_path,
-                    st.session_state.speaker1_name,
-                    st.session_state.speaker2_name,
-                    preview_path,
-                )
-
-                if success:
-                    # Читаем байты созданного превью
-                    with open(preview_path, "rb") as f:
-                        return f.read()
-                else:
-                    return None
-
-        except Exception as e:
-            logger.error(f"Ошибка создания предпросмотра: {e}")
-            return None
-
-    @staticmethod
-    def _get_state_hash_for_caching() -> int:
-        """
-        Генерирует хеш для всех параметров, влияющих на предпросмотр.
-        Этот хеш используется декоратором @st.cache_data для определения,
-        нужно ли пересчитывать кэш.
-
-        :return: Целочисленный хеш.
-        """
-        background_file = st.session_state.get("background_file")
-        speaker1_file = st.session_state.get("speaker1_file")
-        speaker2_file = st.session_state.get("speaker2_file")
-
-        hash_data = (
-            # Файлы: используем file_id для уникальности (если файл перезагружается),
-            # иначе None.
-            background_file.file_id if background_file else None,
-            speaker1_file.file_id if speaker1_file else None,
-            speaker2_file.file_id if speaker2_file else None,
-            # Настройки, влияющие на внешний вид
-            st.session_state.speaker1_name,
-            st.session_state.speaker2_name,
-            st.session_state.speaker_width,
-            st.session_state.speaker_height,
-            st.session_state.manual_font_size,
-            st.session_state.font_color,
-            st.session_state.plate_bg_color,
-            st.session_state.plate_border_color,
-            st.session_state.plate_border_width,
-            st.session_state.plate_padding,
-            st.session_state.output_width,
-            st.session_state.output_height,
-            st.session_state.font_family,
-        )
-        return hash(hash_data)
-
     def _render_export_section(self):
-        """Рендерит кнопку запуска экспорта видео."""
+        """Рендерит кнопку запуска экспорта видео и кнопку скачивания результата."""
         st.markdown("---")
         col1, col2, col3 = st.columns([1, 2, 1])
         with col2:
@@ -590,57 +1104,69 @@ class VideoMeetingComposerApp:
                         "❌ Пожалуйста, загрузите все необходимые файлы и введите имена спикеров"
                     )
 
+            # Кнопка скачивания показывается при каждом перезапуске, пока файл
+            # существует: после нажатия на нее или изменения настроек не нужно
+            # заново кодировать видео.
+            last_output = st.session_state.get("last_output")
+            if last_output and os.path.exists(last_output):
+                # Файл читается только по нажатию кнопки (отложенная загрузка),
+                # а не держится в памяти сервера все время, пока видна кнопка
+                st.download_button(
+                    label="📥 Скачать видео",
+                    data=partial(read_file_bytes, last_output),
+                    file_name="meeting_output.mp4",
+                    mime="video/mp4",
+                    width="stretch",
+                )
+
     def _create_video(self):
         """
         Основная логика создания и экспорта итогового видеофайла.
-        Использует временную директорию для работы с файлами.
+        Результат сохраняется в директории сессии, путь к нему — в
+        st.session_state.last_output (см. _render_export_section).
         """
         with st.spinner("🎬 Создание видео... Это может занять несколько минут"):
             try:
-                # 1. Используем временную директорию
-                with tempfile.TemporaryDirectory() as temp_dir:
-                    # Сохраняем загруженные файлы из Streamlit
-                    background_path, speaker1_path, speaker2_path = save_get_files(
-                        temp_dir
-                    )
+                # 1. Берем копии загруженных файлов (записаны один раз за сессию)
+                background_path, speaker1_path, speaker2_path = save_get_files()
 
-                    # 2. Создание конфигураций
-                    speaker_config, export_config = self._get_config_objects()
-
-                    output_file_path = os.path.join(temp_dir, "meeting_output.mp4")
-                    meeting_config = MeetingConfig(
-                        background_path=background_path,
-                        speaker1_path=speaker1_path,
-                        speaker2_path=speaker2_path,
-                        speaker1_name=st.session_state.speaker1_name,
-                        speaker2_name=st.session_state.speaker2_name,
-                        output_path=output_file_path,
-                    )
+                # 2. Создание конфигураций
+                speaker_config, export_config = self._get_config_objects()
 
-                    # 3. Создание и запуск сервисов
-                    composition_engine = CompositionEngine(
-                        speaker_config, export_config
-                    )
-                    export_service = ExportService(export_config)
+                # Результат пишется в директорию сессии, а не во временную:
+                # файл должен существовать, когда пользователь нажмет «Скачать»
+                output_file_path = os.path.join(
+                    _get_session_dir(), "meeting_output.mp4"
+                )
+                meeting_config = MeetingConfig(
+                    background_path=background_path,
+                    speaker1_path=speaker1_path,
+                    speaker2_path=speaker2_path,
+                    speaker1_name=st.session_state.speaker1_name,
+                    speaker2_name=st.session_state.speaker2_name,
+                    output_path=output_file_path,
+                )
 
-                    # 4. Запуск процесса экспорта
+                # 3. Создание и запуск сервисов
+                composition_engine = get_composition_engine(
+                    speaker_config, export_config
+                )
+                export_service = get_export_service(export_config)
+
+                # 4. Запуск процесса экспорта (ждет свободного слота, если
+                # другие сессии уже экспортируют видео)
+                with get_export_slots():
                     success = export_service.export_video(
                         meeting_config, composition_engine
                     )
 
-                    if success:
-                        st.success("✅ Видео создано успешно!")
-                        # Предлагаем пользователю скачать созданный файл
-                        with open(meeting_config.output_path, "rb") as f:
-                            st.download_button(
-                                label="📥 Скачать видео",
-                                data=f.read(),
-                                file_name="meeting_output.mp4",
-                                mime="video/mp4",
-                                width="stretch",
-                            )
-                    else:
-                        st.error("❌ Ошибка создания видео")
+                if success:
+                    st.success("✅ Видео создано успешно!")
+                    st.session_state.last_output = meeting_config.output_path
+                else:
+                    # Прежний результат мог быть перезаписан неудачным экспортом
+                    st.session_state.pop("last_output", None)
+                    st.error("❌ Ошибка создания видео")
 
             except Exception as e:
                 # Обработка и логирование любых исключений в процессе создания видео
@@ -652,6 +1178,12 @@ class VideoMeetingComposerApp:
         Главный метод для запуска и отображения интерфейса приложения.
         Разделяет экран на секции предпросмотра и настроек.
         """
+        # Тяжелые импорты и проверка GPU выполняются в фоне, не задерживая интерфейс
+        start_warm_up()
+
+        # Удаляем с диска копии файлов, замененных или удаленных пользователем
+        prune_saved_uploads()
+
         # Создаем две колонки: 2/3 для предпросмотра, 1/3 для настроек
         col_preview, col_settings = st.columns([2, 1])
 
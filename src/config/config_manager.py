@@ -6,18 +6,41 @@
 и базовую валидацию входных данных.
 """
 
+from __future__ import annotations
+
 import argparse
 import os
-from typing import Tuple
+from typing import TYPE_CHECKING, Tuple
+
+# Модели Pydantic (и сам pydantic) импортируются только для аннотаций:
+# во время выполнения они загружаются в create_configs_from_args, поэтому
+# --help и ошибки разбора аргументов не платят за их импорт.
+if TYPE_CHECKING:
+    from ..models.meeting_config import MeetingConfig
+    from ..models.speaker_config import SpeakerConfig
+    from ..models.export_config import ExportConfig
 
-# Обратите внимание: импорты моделей должны быть относительными
-from ..models.meeting_config import MeetingConfig
-from ..models.speaker_config import SpeakerConfig
-from ..models.export_config import (
-    ExportConfig,
-    VideoCodecConfig,
-    AudioCodecConfig,
-    GPUConfig,
+# Допустимые значения --video-codec и --ffmpeg-preset (совпадают с Literal
+# полей VideoCodecConfig). Кортежи создаются один раз при импорте модуля.
+VIDEO_CODEC_CHOICES = (
+    "libx264",
+    "libx265",
+    "h264_nvenc",
+    "hevc_nvenc",
+    "h264_amf",
+    "h264_qsv",
+    "h264_vaapi",
+)
+FFMPEG_PRESET_CHOICES = (
+    "ultrafast",
+    "superfast",
+    "veryfast",
+    "faster",
+    "fast",
+    "medium",
+    "slow",
+    "slower",
+    "veryslow",
 )
 
 
@@ -130,21 +153,17 @@ class ConfigManager:
 
         # --- Параметры кодирования ---
         codec_group = parser.add_argument_group("Параметры кодирования FFmpeg")
+        codec_group.add_argument(
+            "--video-codec",
+            default="libx264",
+            choices=VIDEO_CODEC_CHOICES,
+            help="Видео кодек. Аппаратный кодек используется, если он работает на этой машине и GPU не отключен, иначе CPU кодек того же формата.",
+        )
         codec_group.add_argument(
             "--ffmpeg-preset",
-            default="fast",
-            choices=[
-                "ultrafast",
-                "superfast",
-                "veryfast",
-                "faster",
-                "fast",
-                "medium",
-                "slow",
-                "slower",
-                "veryslow",
-            ],
-            help="Пресет кодирования (скорость/качество). 'fast' - хороший баланс.",
+            default="faster",
+            choices=FFMPEG_PRESET_CHOICES,
+            help="Пресет кодирования (скорость/качество). 'faster' (по умолчанию) - хороший баланс.",
         )
         codec_group.add_argument(
             "--ffmpeg-crf",
@@ -164,6 +183,12 @@ class ConfigManager:
             help="Отключить автоматическое определение и использование GPU ускорения (например, NVENC или QSV).",
         )
 
+        codec_group.add_argument(
+            "--no-hwaccel",
+            action="store_true",
+            help="Отключить аппаратное декодирование входных видео (CUDA) при кодировании через NVENC.",
+        )
+
         return parser
 
     @staticmethod
@@ -180,6 +205,16 @@ class ConfigManager:
         :param args: Объект, содержащий аргументы, спарсенные с помощью argparse.
         :return: Кортеж из трех настроенных конфигурационных объектов.
         """
+        # Обратите внимание: импорты моделей должны быть относительными
+        from ..models.meeting_config import MeetingConfig
+        from ..models.speaker_config import SpeakerConfig
+        from ..models.export_config import (
+            ExportConfig,
+            VideoCodecConfig,
+            AudioCodecConfig,
+            GPUConfig,
+        )
+
         # 1. Конфигурация встречи (MeetingConfig) - описывает входные/выходные пути и имена
         meeting_config = MeetingConfig(
             background_path=args.background,
@@ -204,11 +239,14 @@ class ConfigManager:
             fps=args.fps,
             threads=args.ffmpeg_threads,  # Количество потоков для FFmpeg
             video_codec=VideoCodecConfig(
-                preset=args.ffmpeg_preset, crf=args.ffmpeg_crf
+                codec=args.video_codec, preset=args.ffmpeg_preset, crf=args.ffmpeg_crf
             ),
             audio_codec=AudioCodecConfig(),
             # use_gpu: True, если флаг --no-gpu НЕ указан (т.е., not args.no_gpu)
-            gpu_config=GPUConfig(use_gpu=not args.no_gpu),
+            gpu_config=GPUConfig(
+                use_gpu=not args.no_gpu,
+                hwaccel=None if args.no_hwaccel else "cuda",
+            ),
         )
 
         return meeting_config, speaker_config, export_config
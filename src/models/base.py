@@ -17,6 +17,9 @@ class BaseConfig(BaseModel, ABC):
         extra="forbid",  # Запрет дополнительных полей
         validate_assignment=True,  # Валидация при присваивании
         strict=True,  # Строгие типы
+        # Валидатор строится при первом создании экземпляра, а не при импорте:
+        # модели, которые в запуске не используются, не строятся вовсе.
+        defer_build=True,
     )
 
     @abstractmethod
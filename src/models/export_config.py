@@ -16,9 +16,15 @@ class VideoCodecConfig(BaseConfig):
         bitrate: Целевой битрейт
     """
 
-    codec: Literal["libx264", "libx265", "h264_nvenc", "h264_qsv", "h264_vaapi"] = (
-        Field(default="libx264")
-    )
+    codec: Literal[
+        "libx264",
+        "libx265",
+        "h264_nvenc",
+        "hevc_nvenc",
+        "h264_amf",
+        "h264_qsv",
+        "h264_vaapi",
+    ] = Field(default="libx264")
     preset: Literal[
         "ultrafast",
         "superfast",
@@ -29,7 +35,7 @@ class VideoCodecConfig(BaseConfig):
         "slow",
         "slower",
         "veryslow",
-    ] = Field(default="fast")
+    ] = Field(default="faster")
     crf: int = Field(default=23, ge=0, le=51)
     bitrate: str = Field(default="5000k")
 
@@ -65,13 +71,15 @@ class GPUConfig(BaseConfig):
 
     Attributes:
         use_gpu: Использовать ли GPU для кодирования
-        gpu_codec: Конкретный GPU кодек (определяется автоматически)
+        gpu_codec: Конкретный GPU кодек (определяется автоматически, None = CPU)
+        hwaccel: Аппаратное декодирование входных видео при NVENC (None = CPU)
     """
 
     use_gpu: bool = Field(default=True)
-    gpu_codec: Optional[Literal["h264_nvenc", "h264_qsv", "h264_vaapi"]] = Field(
-        default=None
-    )
+    gpu_codec: Optional[
+        Literal["h264_nvenc", "hevc_nvenc", "h264_amf", "h264_qsv", "h264_vaapi"]
+    ] = Field(default=None)
+    hwaccel: Optional[Literal["cuda"]] = Field(default="cuda")
 
     def validate_config(self) -> bool:
         """GPU конфигурация всегда валидна."""
@@ -104,19 +112,16 @@ class ExportConfig(BaseConfig):
     threads: int = Field(default=0, ge=0, le=64)
 
     def validate_config(self) -> bool:
-        """Проверка корректности всех параметров экспорта."""
-        try:
-            if self.width <= 0 or self.height <= 0 or self.fps <= 0:
-                return False
-
-            return (
-                self.video_codec.validate_config()
-                and self.audio_codec.validate_config()
-                and self.gpu_config.validate_config()
-            )
-
-        except Exception:
-            return False
+        """
+        Проверка корректности всех параметров экспорта.
+
+        Размеры и FPS уже ограничены Field(gt=0) при создании и присваивании,
+        поэтому проверяются только вложенные конфигурации.
+        """
+        return all(
+            config.validate_config()
+            for config in (self.video_codec, self.audio_codec, self.gpu_config)
+        )
 
     # Свойства для обратной совместимости с прямым доступом
     @property
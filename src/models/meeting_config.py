@@ -5,7 +5,7 @@
 а также имена спикеров.
 """
 
-from pathlib import Path
+import os
 from pydantic import Field
 from .base import BaseConfig
 
@@ -47,25 +47,25 @@ class MeetingConfig(BaseConfig):
         """
         Проверка существования файлов, указанных в конфигурации.
 
-        Выполняет проверку наличия фонового изображения и видеофайлов спикеров,
-        используя модуль `pathlib.Path`.
+        Выполняет проверку наличия фонового изображения и видеофайлов спикеров
+        через os.path.exists (без создания объектов Path).
         :return: True, если все необходимые файлы найдены, иначе False (с выводом ошибки в консоль).
         """
         try:
             # 1. Проверяем существование фонового изображения
-            if not Path(self.background_path).exists():
+            if not os.path.exists(self.background_path):
                 raise FileNotFoundError(
                     f"Фоновое изображение не найдено: {self.background_path}"
                 )
 
             # 2. Проверяем существование видео первого спикера
-            if not Path(self.speaker1_path).exists():
+            if not os.path.exists(self.speaker1_path):
                 raise FileNotFoundError(
                     f"Видео первого спикера не найдено: {self.speaker1_path}"
                 )
 
             # 3. Проверяем существование видео второго спикера
-            if not Path(self.speaker2_path).exists():
+            if not os.path.exists(self.speaker2_path):
                 raise FileNotFoundError(
                     f"Видео второго спикера не найдено: {self.speaker2_path}"
                 )
@@ -6,7 +6,7 @@
 2. Общей конфигурации отображения окна спикера и плашки с именем (SpeakerConfig).
 """
 
-from typing import Optional, Tuple
+from typing import Literal, Optional, Tuple
 from pydantic import Field
 from .base import BaseConfig
 
@@ -66,6 +66,9 @@ class SpeakerConfig(BaseConfig):
         plate_border_color (Tuple[int, ...]): Цвет рамки плашки (R, G, B).
         plate_border_width (int): Толщина рамки плашки в пикселях.
         plate_padding (int): Внутренние отступы плашки вокруг текста.
+        font_family (str): Название шрифта для плашки.
+        render_backend (str): Чем рисовать плашку: "pil" (TTF шрифты) или
+                              "opencv" (быстрее, встроенный шрифт, только ASCII).
     """
 
     # Размеры окна спикера (используется для ресайза видео). Должны быть > 0.
@@ -106,6 +109,10 @@ class SpeakerConfig(BaseConfig):
         default=10, ge=0, le=50, description="Внутренние отступы плашки (пиксели)"
     )
     font_family: str = Field()
+    render_backend: Literal["pil", "opencv"] = Field(
+        default="pil",
+        description="Отрисовка плашки: pil (TTF) или opencv (встроенный шрифт, ASCII)",
+    )
 
     def validate_config(self) -> bool:
         """
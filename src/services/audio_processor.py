@@ -9,6 +9,7 @@ import numpy as np
 import librosa
 import soundfile as sf
 from typing import Optional, Tuple
+from ..utils.temp import TEMP_ROOT
 
 
 class AudioProcessor:
@@ -45,7 +46,7 @@ class AudioProcessor:
         """
         try:
             # Создаем временный WAV-файл для извлеченного аудио
-            temp_audio = tempfile.mktemp(suffix=".wav")
+            temp_audio = tempfile.mktemp(suffix=".wav", dir=TEMP_ROOT)
 
             # Команда FFmpeg для извлечения аудио:
             # -vn (отключить видео)
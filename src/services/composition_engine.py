@@ -5,7 +5,8 @@
 
 import numpy as np
 import cv2
-from typing import Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 from ..models.speaker_config import SpeakerConfig
 from ..models.export_config import ExportConfig
 from .video_processor import VideoProcessor
@@ -32,6 +33,9 @@ class CompositionEngine:
         # Инициализация дочерних сервисов, которые будут выполнять основную работу
         self.video_processor = VideoProcessor(export_config)
         self.image_processor = ImageProcessor(speaker_config)
+        # Готовые плашки по имени спикера: плашка зависит только от имени и
+        # конфигурации, поэтому рисуется один раз, а не на каждом кадре.
+        self._plate_cache: Dict[str, np.ndarray] = {}
 
     def compose_frame_with_names(
         self,
@@ -74,13 +78,9 @@ class CompositionEngine:
         :param speaker2_name: Имя второго спикера.
         :return: Итоговый композиционный кадр в формате np.ndarray.
         """
-        # 1. Изменение размера фона до целевого разрешения экспорта (например, 1920x1080)
-        background_resized = cv2.resize(
-            background,
-            (self.export_config.width, self.export_config.height),
-            interpolation=cv2.INTER_LANCZOS4,
-        )
-        result = background_resized.copy()
+        # 1. Фон в целевом разрешении экспорта (например, 1920x1080). Фон,
+        # подготовленный prepare_background, не масштабируется, а только копируется.
+        result = self.prepare_background(background).copy()
 
         # 2. Вычисление позиций окон спикеров
         speaker1_pos, speaker2_pos = self._calculate_speaker_positions()
@@ -99,6 +99,29 @@ class CompositionEngine:
 
         return result
 
+    def prepare_background(self, background: np.ndarray) -> np.ndarray:
+        """
+        Возвращает фон, масштабированный до разрешения экспорта.
+        Фон, уже имеющий нужный размер, возвращается без изменений.
+
+        Результат не запоминается в движке: экземпляр общий для всех сессий.
+        Покадровый экспорт вызывает метод один раз перед циклом и передает
+        готовый фон в compose_frame на каждом кадре.
+
+        :param background: Кадр фонового изображения.
+        :return: Фон в разрешении экспорта (масштабированный - только для чтения).
+        """
+        width, height = self.export_config.width, self.export_config.height
+        if background.shape[:2] == (height, width):
+            # Фон уже подготовлен в нужном разрешении (например, кэш предпросмотра)
+            return background
+
+        background_resized = self.video_processor.resize_frame(
+            background, width, height
+        )
+        background_resized.flags.writeable = False
+        return background_resized
+
     def _calculate_speaker_positions(self) -> Tuple[Tuple[int, int], Tuple[int, int]]:
         """
         Вычисляет координаты (x, y) верхнего левого угла для окон двух спикеров.
@@ -154,20 +177,19 @@ class CompositionEngine:
         """
         x, y = position
 
-        # 1. Изменяем размер кадра спикера с сохранением пропорций (letterboxing)
-        speaker_resized = self.video_processor.resize_with_aspect_ratio(
-            speaker_frame, self.speaker_config.width, self.speaker_config.height
-        )
-
-        # 2. Проверяем, что окно спикера полностью помещается в кадр
-        if (
-            y + self.speaker_config.height <= self.export_config.height
-            and x + self.speaker_config.width <= self.export_config.width
-        ):
-            # Размещаем масштабированный кадр спикера в ROI (области интереса)
-            frame[
-                y : y + self.speaker_config.height, x : x + self.speaker_config.width
-            ] = speaker_resized
+        # 1. Проверяем, что окно спикера полностью помещается в кадр
+        if self._speaker_fits(position):
+            # 2. Масштабируем кадр спикера с сохранением пропорций (letterboxing)
+            # прямо в ROI (область интереса) итогового кадра, без промежуточной копии
+            self.video_processor.resize_with_aspect_ratio(
+                speaker_frame,
+                self.speaker_config.width,
+                self.speaker_config.height,
+                dst=frame[
+                    y : y + self.speaker_config.height,
+                    x : x + self.speaker_config.width,
+                ],
+            )
 
             # 3. Добавляем плашку с именем, если имя задано
             if name:
@@ -175,22 +197,33 @@ class CompositionEngine:
 
         return frame
 
-    def _add_name_plate(
-        self, frame: np.ndarray, speaker_x: int, speaker_y: int, name: str
-    ) -> np.ndarray:
+    def _speaker_fits(self, position: Tuple[int, int]) -> bool:
         """
-        Создает и накладывает плашку с именем под окном спикера.
+        Проверяет, что окно спикера в заданной позиции полностью помещается в кадр.
+
+        :param position: Координаты (x, y) верхнего левого угла окна спикера.
+        :return: True, если окно помещается в кадр.
+        """
+        x, y = position
+        return (
+            y + self.speaker_config.height <= self.export_config.height
+            and x + self.speaker_config.width <= self.export_config.width
+        )
+
+    def render_name_plate(self, name: str) -> np.ndarray:
+        """
+        Создает плашку с именем по параметрам из конфигурации спикера.
+        Результат кэшируется по имени; массив только для чтения.
 
-        :param frame: Кадр для наложения.
-        :param speaker_x: X-координата окна спикера.
-        :param speaker_y: Y-координата окна спикера.
         :param name: Имя, которое будет отображено на плашке.
-        :return: Обновленный кадр.
+        :return: Плашка в формате BGRA numpy array.
         """
-        sc = self.speaker_config  # Чтобы не писать каждый раз self.speaker_config
+        plate = self._plate_cache.get(name)
+        if plate is not None:
+            return plate
 
-        # 1. Создаем плашку с параметрами из конфигурации
-        plate_pil = self.image_processor.create_name_plate(
+        sc = self.speaker_config  # Чтобы не писать каждый раз self.speaker_config
+        plate_style = dict(
             name=name,
             width=sc.width,
             font_size=sc.font_size,
@@ -199,34 +232,107 @@ class CompositionEngine:
             border_color=sc.plate_border_color,
             border_width=sc.plate_border_width,
             padding=sc.plate_padding,
-            font_family=sc.font_family,
         )
 
-        # 2. Конвертируем PIL в numpy (BGRA)
-        plate_np = self.image_processor.convert_pil_to_cv2(plate_pil)
-
-        # 3. Вычисляем позицию плашки (смещение на 5px ниже окна спикера)
-        plate_height = plate_np.shape[0]
-        plate_y = speaker_y + sc.height + 5
-
-        # 4. Проверка границ по высоте
-        if plate_y + plate_height <= self.export_config.height:
-            # Центрируем плашку по ширине окна спикера
-            plate_width = plate_np.shape[1]
-            plate_x = speaker_x + (sc.width - plate_width) // 2
-
-            # 5. Накладываем плашку с альфа-каналом
-            if plate_x >= 0 and plate_y >= 0:
-                frame = self.image_processor.overlay_image(
-                    frame,
-                    plate_np,
-                    plate_x,
-                    plate_y,
-                    alpha=1.0,  # плашка полностью видима
-                )
+        if sc.render_backend == "opencv" and name.isascii():
+            # Быстрая отрисовка средствами OpenCV (встроенный шрифт умеет только ASCII)
+            plate = self.image_processor.create_name_plate_cv2(**plate_style)
+        else:
+            # 1. Создаем плашку с параметрами из конфигурации (PIL, TTF шрифт)
+            plate_pil = self.image_processor.create_name_plate(
+                **plate_style, font_family=sc.font_family
+            )
+            # 2. Конвертируем PIL в numpy (BGRA)
+            plate = self.image_processor.convert_pil_to_cv2(plate_pil)
+
+        plate.flags.writeable = False
+        self._plate_cache[name] = plate
+        return plate
+
+    def calculate_plate_position(
+        self, plate: np.ndarray, speaker_x: int, speaker_y: int
+    ) -> Optional[Tuple[int, int]]:
+        """
+        Вычисляет позицию плашки: на 5px ниже окна спикера, по центру его ширины.
+
+        :param plate: Плашка (BGRA numpy array).
+        :param speaker_x: X-координата окна спикера.
+        :param speaker_y: Y-координата окна спикера.
+        :return: Координаты (x, y) плашки или None, если она не помещается в кадр.
+        """
+        plate_height, plate_width = plate.shape[:2]
+        plate_y = speaker_y + self.speaker_config.height + 5
+        plate_x = speaker_x + (self.speaker_config.width - plate_width) // 2
+
+        if (
+            plate_y + plate_height <= self.export_config.height
+            and plate_x + plate_width <= self.export_config.width
+            and plate_x >= 0
+            and plate_y >= 0
+        ):
+            return plate_x, plate_y
+        return None
+
+    def _add_name_plate(
+        self, frame: np.ndarray, speaker_x: int, speaker_y: int, name: str
+    ) -> np.ndarray:
+        """
+        Создает и накладывает плашку с именем под окном спикера.
+
+        :param frame: Кадр для наложения.
+        :param speaker_x: X-координата окна спикера.
+        :param speaker_y: Y-координата окна спикера.
+        :param name: Имя, которое будет отображено на плашке.
+        :return: Обновленный кадр.
+        """
+        plate_np = self.render_name_plate(name)
+        plate_position = self.calculate_plate_position(plate_np, speaker_x, speaker_y)
+
+        # Накладываем плашку с альфа-каналом, если она помещается в кадр
+        if plate_position is not None:
+            plate_x, plate_y = plate_position
+            frame = self.image_processor.overlay_image(
+                frame,
+                plate_np,
+                plate_x,
+                plate_y,
+                alpha=1.0,  # плашка полностью видима
+            )
 
         return frame
 
+    def get_overlay_layout(
+        self, speaker1_name: str, speaker2_name: str
+    ) -> List[Optional[dict]]:
+        """
+        Описывает раскладку кадра для внешних компоновщиков (граф фильтров FFmpeg):
+        те же позиции окон и плашек, что использует compose_frame.
+
+        :param speaker1_name: Имя первого спикера.
+        :param speaker2_name: Имя второго спикера.
+        :return: Список из двух элементов (по спикеру). Элемент равен None, если окно
+                 не помещается в кадр, иначе словарь с ключами 'position' (x, y),
+                 'plate' (BGRA numpy array или None) и 'plate_position' ((x, y) или None).
+        """
+        layout = []
+        positions = self._calculate_speaker_positions()
+        for position, name in zip(positions, (speaker1_name, speaker2_name)):
+            if not self._speaker_fits(position):
+                layout.append(None)
+                continue
+
+            plate, plate_position = None, None
+            if name:
+                plate = self.render_name_plate(name)
+                plate_position = self.calculate_plate_position(plate, *position)
+                if plate_position is None:
+                    plate = None
+
+            layout.append(
+                {"position": position, "plate": plate, "plate_position": plate_position}
+            )
+        return layout
+
     def create_preview(
         self,
         background_path: str,
@@ -248,50 +354,86 @@ class CompositionEngine:
         :param output_path: Путь для сохранения итогового JPG-файла предпросмотра.
         :return: True, если предпросмотр успешно создан, иначе False.
         """
+        # Загружаем фон, используя ImageProcessor
+        background = self.image_processor.load_image(background_path)
+        if background is None:
+            return False
+
+        return self.create_preview_from_image(
+            background,
+            speaker1_path,
+            speaker2_path,
+            speaker1_name,
+            speaker2_name,
+            output_path,
+        )
+
+    def create_preview_from_image(
+        self,
+        background: np.ndarray,
+        speaker1_path: str,
+        speaker2_path: str,
+        speaker1_name: str,
+        speaker2_name: str,
+        output_path: str = "preview.jpg",
+    ) -> bool:
+        """
+        Создает кадр предпросмотра по уже загруженному в память фону.
+        Позволяет не сохранять фоновое изображение на диск (например, при загрузке из UI).
+
+        :param background: Фоновое изображение (BGR numpy array).
+        :param speaker1_path: Путь к видео первого спикера.
+        :param speaker2_path: Путь к видео второго спикера.
+        :param speaker1_name: Имя первого спикера.
+        :param speaker2_name: Имя второго спикера.
+        :param output_path: Путь для сохранения итогового JPG-файла предпросмотра.
+        :return: True, если предпросмотр успешно создан, иначе False.
+        """
+        composed_frame = self.compose_preview_frame(
+            background, speaker1_path, speaker2_path, speaker1_name, speaker2_name
+        )
+        if composed_frame is None:
+            return False
+
+        # Сохраняем предпросмотр
+        return bool(cv2.imwrite(output_path, composed_frame))
+
+    def compose_preview_frame(
+        self,
+        background: np.ndarray,
+        speaker1_path: str,
+        speaker2_path: str,
+        speaker1_name: str,
+        speaker2_name: str,
+    ) -> Optional[np.ndarray]:
+        """
+        Компонует кадр предпросмотра в памяти из первых кадров видео спикеров.
+
+        :param background: Фоновое изображение (BGR numpy array).
+        :param speaker1_path: Путь к видео первого спикера.
+        :param speaker2_path: Путь к видео второго спикера.
+        :param speaker1_name: Имя первого спикера.
+        :param speaker2_name: Имя второго спикера.
+        :return: Кадр предпросмотра (BGR numpy array) или None в случае ошибки.
+        """
         try:
-            # 1. Загружаем фон, используя ImageProcessor
-            background = self.image_processor.load_image(background_path)
-            if background is None:
-                return False
-
-            # 2. Загружаем видео спикеров, используя VideoProcessor
-            cap1 = self.video_processor.load_video(speaker1_path)
-            cap2 = self.video_processor.load_video(speaker2_path)
-
-            if not cap1.isOpened() or not cap2.isOpened():
-                # Проверки уже выполнены внутри load_video, но лучше убедиться
-                print("Не удалось открыть один или оба видео файла.")
-                if cap1.isOpened():
-                    cap1.release()
-                if cap2.isOpened():
-                    cap2.release()
-                return False
-
-            # 3. Получаем первый кадр
-            ret1, frame1 = cap1.read()
-            ret2, frame2 = cap2.read()
-
-            if not ret1 or not ret2:
+            # 1. Читаем первый кадр каждого видео спикера (параллельно:
+            # декодирование в OpenCV/FFmpeg отпускает GIL)
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                frame1, frame2 = executor.map(
+                    self.video_processor.grab_frame, (speaker1_path, speaker2_path)
+                )
+
+            if frame1 is None or frame2 is None:
                 print("Не удалось прочитать кадры из видео.")
-                cap1.release()
-                cap2.release()
-                return False
+                return None
 
-            # 4. Создаем композицию
-            composed_frame = self.compose_frame_with_names(
+            # 2. Создаем композицию
+            return self.compose_frame_with_names(
                 background, frame1, frame2, speaker1_name, speaker2_name
             )
 
-            # 5. Сохраняем предпросмотр
-            cv2.imwrite(output_path, composed_frame)
-
-            # 6. Освобождаем ресурсы
-            cap1.release()
-            cap2.release()
-
-            return True
-
         except Exception as e:
             # Общий обработчик ошибок
             print(f"Ошибка создания предпросмотра: {e}")
-            return False
+            return None
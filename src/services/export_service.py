@@ -3,16 +3,243 @@
 """
 
 import os
+import shutil
 import tempfile
 import subprocess
 import cv2
 import numpy as np
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import List, Optional, Tuple
+from ..utils.temp import TEMP_ROOT
 from ..models.export_config import ExportConfig
 from ..models.meeting_config import MeetingConfig
 from .composition_engine import CompositionEngine
 from .audio_processor import AudioProcessor
 
+# Аппаратные H.264 кодеки в порядке приоритета и сообщения для лога
+GPU_CODECS = (
+    ("h264_nvenc", "Обнаружен NVIDIA GPU - используем NVENC"),
+    ("h264_amf", "Обнаружен AMD GPU - используем AMF"),
+    ("h264_qsv", "Обнаружен Intel GPU - используем QSV"),
+    ("h264_vaapi", "Обнаружен VAAPI - используем аппаратное ускорение"),
+)
+
+# Кодеки, которые можно выбрать в UI: CPU кодеки доступны всегда,
+# аппаратные показываются, только если прошли пробное кодирование.
+CPU_CODECS = ("libx264", "libx265")
+HARDWARE_CODECS = ("h264_nvenc", "hevc_nvenc", "h264_amf", "h264_qsv", "h264_vaapi")
+
+# Соответствие пресетов libx264 пресетам NVENC (p1 - самый быстрый, p7 - самый качественный).
+# В UI остаются пресеты libx264, чтобы они были валидны и для CPU фолбэка.
+NVENC_PRESETS = {
+    "ultrafast": "p1",
+    "superfast": "p2",
+    "veryfast": "p3",
+    "faster": "p3",
+    "fast": "p4",
+    "medium": "p5",
+    "slow": "p6",
+    "slower": "p7",
+    "veryslow": "p7",
+}
+
+
+@lru_cache(maxsize=1)
+def list_ffmpeg_encoders() -> str:
+    """
+    Возвращает вывод `ffmpeg -encoders`.
+    Результат кэшируется: FFmpeg опрашивается один раз за время жизни процесса.
+    """
+    try:
+        result = subprocess.run(
+            ["ffmpeg", "-hide_banner", "-encoders"], capture_output=True, text=True
+        )
+        return result.stdout
+    except Exception as e:
+        print("Ошибка получения списка кодеков FFmpeg", e)
+        return ""
+
+
+@lru_cache(maxsize=None)
+def probe_encoder(codec: str) -> bool:
+    """
+    Проверяет, что кодек не только собран в FFmpeg, но и работает на этой машине:
+    кодирует несколько кадров тестового сигнала в null.
+
+    Сборки FFmpeg из дистрибутивов часто содержат h264_nvenc без GPU,
+    поэтому одного наличия в `ffmpeg -encoders` недостаточно.
+    """
+    if codec not in list_ffmpeg_encoders():
+        return False
+    try:
+        result = subprocess.run(
+            [
+                "ffmpeg",
+                "-hide_banner",
+                "-f",
+                "lavfi",
+                "-i",
+                "color=c=black:s=256x256:d=0.2",
+                "-c:v",
+                codec,
+                "-f",
+                "null",
+                "-",
+            ],
+            capture_output=True,
+            timeout=30,
+        )
+        return result.returncode == 0
+    except Exception:
+        return False
+
+
+@lru_cache(maxsize=1)
+def detect_gpu_codec() -> Optional[str]:
+    """
+    Автоматическое определение доступного GPU кодека.
+    Результат кэшируется на процесс, поэтому повторные экспорты не запускают FFmpeg.
+
+    :return: Название аппаратного кодека или None, если доступен только CPU.
+    """
+    for codec, message in GPU_CODECS:
+        if probe_encoder(codec):
+            print(message)
+            return codec
+    print("GPU кодеки не найдены - используем CPU")
+    return None
+
+
+@lru_cache(maxsize=1)
+def list_available_video_codecs() -> Tuple[str, ...]:
+    """
+    Список видео кодеков, которые можно выбрать для экспорта.
+    Результат кэшируется на процесс.
+
+    :return: CPU кодеки и аппаратные кодеки, прошедшие пробное кодирование.
+    """
+    return CPU_CODECS + tuple(codec for codec in HARDWARE_CODECS if probe_encoder(codec))
+
+
+def _amf_quality(preset: str) -> str:
+    """Перевод пресета libx264 в режим качества AMF (speed/balanced/quality)."""
+    if preset in ("ultrafast", "superfast", "veryfast", "faster"):
+        return "speed"
+    if preset in ("fast", "medium"):
+        return "balanced"
+    return "quality"
+
+
+def _cpu_thread_args(codec: str, threads: int) -> Tuple[str, ...]:
+    """
+    Параметры потоков для CPU кодека.
+
+    Для libx264 отключаются sliced-threads: покадровая многопоточность дает
+    большую пропускную способность, а лишний кадр задержки для файла не важен.
+
+    :param codec: Имя CPU кодека FFmpeg.
+    :param threads: Число потоков (0 = все ядра).
+    :return: Кортеж аргументов FFmpeg.
+    """
+    threads = threads or os.cpu_count() or 1
+    args = ("-threads", str(threads))
+    if codec == "libx264":
+        args += (
+            "-x264-params",
+            f"threads={threads}:lookahead-threads={max(1, threads // 4)}"
+            ":sliced-threads=0",
+        )
+    return args
+
+
+@lru_cache(maxsize=128)
+def build_video_codec_args(
+    codec: str,
+    gpu_codec: Optional[str],
+    preset: str,
+    crf: int,
+    bitrate: str,
+    threads: int,
+) -> Tuple[str, ...]:
+    """
+    Собирает аргументы FFmpeg для видео кодека.
+
+    Аргументы зависят только от параметров кодирования, поэтому кэшируются:
+    повторный экспорт с теми же настройками берет готовый кортеж.
+
+    :param codec: CPU кодек из VideoCodecConfig (используется, если gpu_codec None).
+    :param gpu_codec: Аппаратный кодек или None для CPU.
+    :param preset: Пресет libx264 (для NVENC переводится в p1..p7).
+    :param crf: Constant Rate Factor (для GPU кодеков — целевое качество).
+    :param bitrate: Битрейт видео, например "5000k".
+    :param threads: Число потоков CPU кодека (0 = все ядра).
+    :return: Кортеж аргументов FFmpeg.
+    """
+    if gpu_codec in ("h264_nvenc", "hevc_nvenc"):
+        return (
+            "-c:v",
+            gpu_codec,
+            "-preset",
+            NVENC_PRESETS.get(preset, "p4"),
+            "-tune",
+            "hq",
+            "-pix_fmt",
+            "yuv420p",
+            "-rc",
+            "vbr",
+            "-cq",
+            str(crf),
+            "-b:v",
+            bitrate,
+            "-maxrate",
+            bitrate,
+            "-bufsize",
+            str(int(bitrate.replace("k", "")) * 2) + "k",
+        )
+    elif gpu_codec == "h264_amf":
+        return (
+            "-c:v",
+            "h264_amf",
+            "-quality",
+            _amf_quality(preset),
+            "-rc",
+            "cqp",
+            "-qp_i",
+            str(crf),
+            "-qp_p",
+            str(crf),
+        )
+    elif gpu_codec == "h264_qsv":
+        return (
+            "-c:v",
+            "h264_qsv",
+            "-preset",
+            "fast",
+            "-global_quality",
+            str(crf),
+            "-b:v",
+            bitrate,
+        )
+    elif gpu_codec == "h264_vaapi":
+        return ("-c:v", "h264_vaapi", "-qp", str(crf), "-b:v", bitrate)
+    else:
+        # CPU кодирование
+        return (
+            "-c:v",
+            codec,
+            "-preset",
+            preset,
+            "-crf",
+            str(crf),
+            "-b:v",
+            bitrate,
+            # 4:2:0 явно: иначе FFmpeg сохраняет формат входа (например, 4:4:4
+            # из PNG), и такой файл не воспроизводят браузеры и плееры
+            "-pix_fmt",
+            "yuv420p",
+        ) + _cpu_thread_args(codec, threads)
+
 
 class ExportService:
     """Сервис для экспорта готового видео"""
@@ -23,37 +250,255 @@ class ExportService:
         self._detect_gpu_codec()
 
     def _detect_gpu_codec(self):
-        """Автоматическое определение доступного GPU кодека"""
-        if not self.export_config.gpu_config.use_gpu:
-            self.export_config.gpu_config.gpu_codec = "libx264"
+        """
+        Выбор аппаратного кодека по результатам однократной проверки FFmpeg.
+
+        Явно выбранный аппаратный кодек используется, только если GPU разрешен
+        (use_gpu) и кодек работает; иначе экспорт идет на CPU кодеке того же
+        формата. Автоопределение выполняется только для libx264 (значение по
+        умолчанию); libx265 заменяется только на hevc_nvenc, чтобы H.265 не
+        превратился в H.264.
+        """
+        video_codec = self.export_config.video_codec
+        gpu_config = self.export_config.gpu_config
+        gpu_config.gpu_codec = None
+
+        if video_codec.codec in HARDWARE_CODECS:
+            if gpu_config.use_gpu and probe_encoder(video_codec.codec):
+                gpu_config.gpu_codec = video_codec.codec
+                return
+            cpu_codec = "libx265" if video_codec.codec == "hevc_nvenc" else "libx264"
+            reason = "недоступен" if gpu_config.use_gpu else "отключен (GPU выключен)"
+            print(f"Кодек {video_codec.codec} {reason} - используем CPU {cpu_codec}")
+            video_codec.codec = cpu_codec
             return
 
+        if not gpu_config.use_gpu:
+            return
+
+        if video_codec.codec == "libx264":
+            gpu_config.gpu_codec = detect_gpu_codec()
+        elif video_codec.codec == "libx265" and probe_encoder("hevc_nvenc"):
+            print("Обнаружен NVIDIA GPU - используем hevc_nvenc для H.265")
+            gpu_config.gpu_codec = "hevc_nvenc"
+
+    def export_video(
+        self, meeting_config: MeetingConfig, composition_engine: CompositionEngine
+    ) -> bool:
+        """
+        Экспорт готового видео.
+
+        Сначала вся композиция выполняется одним процессом FFmpeg (граф фильтров):
+        кадры не проходят через Python и не перекодируются дважды. Если FFmpeg
+        не справился, используется покадровая композиция через OpenCV.
+        """
+        if self._export_with_filter_graph(meeting_config, composition_engine):
+            print(f"Готово: {meeting_config.output_path}")
+            return True
+
+        print("Граф фильтров FFmpeg не сработал - используем покадровую композицию")
+        return self._export_frame_by_frame(meeting_config, composition_engine)
+
+    def _export_with_filter_graph(
+        self, meeting_config: MeetingConfig, composition_engine: CompositionEngine
+    ) -> bool:
+        """
+        Экспорт за один проход FFmpeg: декодирование, масштабирование, наложение
+        окон спикеров и плашек и кодирование выполняются внутри FFmpeg.
+
+        Раскладка (позиции окон и готовые плашки) берется из CompositionEngine,
+        поэтому результат совпадает с покадровой композицией.
+        """
         try:
-            result = subprocess.run(
-                ["ffmpeg", "-encoders"], capture_output=True, text=True
+            video_processor = composition_engine.video_processor
+
+            # Получаем информацию о видео (оба файла открываются параллельно)
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                info1, info2 = executor.map(
+                    lambda path: self._read_video_info(video_processor, path),
+                    (meeting_config.speaker1_path, meeting_config.speaker2_path),
+                )
+
+            output_fps = video_processor.calculate_output_fps(
+                info1["fps"], info2["fps"]
             )
-            encoders = result.stdout
-
-            if "h264_nvenc" in encoders:
-                print("Обнаружен NVIDIA GPU - используем NVENC")
-                self.export_config.gpu_config.gpu_codec = "h264_nvenc"
-            elif "h264_qsv" in encoders:
-                print("Обнаружен Intel GPU - используем QSV")
-                self.export_config.gpu_config.gpu_codec = "h264_qsv"
-            elif "h264_vaapi" in encoders:
-                print("Обнаружен VAAPI - используем аппаратное ускорение")
-                self.export_config.gpu_config.gpu_codec = "h264_vaapi"
-            else:
-                print("GPU кодеки не найдены - используем CPU")
-                self.export_config.gpu_config.gpu_codec = "libx264"
+            max_duration = max(info1["duration"], info2["duration"])
+            if output_fps <= 0 or max_duration <= 0:
+                return False
+
+            print(
+                f"Создание видео (FFmpeg): {output_fps} FPS, {max_duration:.2f} сек, "
+                f"пресет {self.export_config.video_codec.preset}"
+            )
+
+            layout = composition_engine.get_overlay_layout(
+                meeting_config.speaker1_name, meeting_config.speaker2_name
+            )
+
+            with tempfile.TemporaryDirectory(dir=TEMP_ROOT) as temp_dir:
+                # Входы: фон (зацикленное изображение), затем видео спикеров
+                # (добавляются при сборке команды, см. build_cmd) и прочие входы
+                background_inputs = [
+                    "-loop",
+                    "1",
+                    "-framerate",
+                    str(output_fps),
+                    "-i",
+                    meeting_config.background_path,
+                ]
+                inputs = []
+                width = self.export_config.width
+                height = self.export_config.height
+                speaker_w = composition_engine.speaker_config.width
+                speaker_h = composition_engine.speaker_config.height
+                filters = [f"[0:v]scale={width}:{height}:flags=lanczos,setsar=1[bg]"]
+                last = "bg"
+                input_index = 3
+
+                for idx, (item, info) in enumerate(zip(layout, (info1, info2)), 1):
+                    if item is None:
+                        continue
+                    x, y = item["position"]
+                    # Letterboxing окна спикера, как в VideoProcessor.resize_with_aspect_ratio
+                    filters.append(
+                        f"[{idx}:v]fps={output_fps},"
+                        f"scale={speaker_w}:{speaker_h}:"
+                        f"force_original_aspect_ratio=decrease:flags=lanczos,"
+                        f"pad={speaker_w}:{speaker_h}:(ow-iw)/2:(oh-ih)/2,setsar=1[s{idx}]"
+                    )
+                    # eof_action=pass: после окончания видео спикера остается фон
+                    filters.append(
+                        f"[{last}][s{idx}]overlay={x}:{y}:eof_action=pass[v{idx}]"
+                    )
+                    last = f"v{idx}"
+
+                    if item["plate"] is not None:
+                        plate_path = os.path.join(temp_dir, f"plate{idx}.png")
+                        cv2.imwrite(plate_path, item["plate"])
+                        # Плашка видна, пока идет видео спикера
+                        inputs.extend(
+                            [
+                                "-loop",
+                                "1",
+                                "-framerate",
+                                str(output_fps),
+                                "-t",
+                                f"{info['duration']:.3f}",
+                                "-i",
+                                plate_path,
+                            ]
+                        )
+                        px, py = item["plate_position"]
+                        filters.append(
+                            f"[{last}][{input_index}:v]overlay={px}:{py}:"
+                            f"eof_action=pass[p{idx}]"
+                        )
+                        last = f"p{idx}"
+                        input_index += 1
+
+                filters.append(f"[{last}]format=yuv420p[vout]")
+                maps = ["-map", "[vout]"]
+
+                # Аудио смешивается прежним способом и подается отдельным входом
+                audio_args = []
+                mixed_audio = self._mix_speakers_audio(meeting_config, max_duration)
+                if mixed_audio is not None:
+                    temp_audio = os.path.join(temp_dir, "mixed.wav")
+                    if self.audio_processor.save_audio(mixed_audio, temp_audio):
+                        inputs.extend(["-i", temp_audio])
+                        maps.extend(["-map", f"{input_index}:a"])
+                        audio_args = ["-c:a", "aac", "-b:a", "128k"]
+
+                output_args = audio_args + [
+                    "-t",
+                    f"{max_duration:.3f}",
+                    "-movflags",
+                    "+faststart",
+                    meeting_config.output_path,
+                ]
+
+                def build_cmd(hwaccel_args: List[str]) -> List[str]:
+                    speaker_inputs = []
+                    for path in (
+                        meeting_config.speaker1_path,
+                        meeting_config.speaker2_path,
+                    ):
+                        speaker_inputs += hwaccel_args + ["-i", path]
+                    cmd = ["ffmpeg", "-hide_banner", "-y"] + background_inputs
+                    cmd += speaker_inputs + inputs
+                    return cmd + ["-filter_complex", ";".join(filters)] + maps
+
+                # Текущий (возможно GPU) кодек, затем фолбэк на CPU
+                if self._run_ffmpeg(
+                    build_cmd(self._get_hwaccel_input_args())
+                    + self._get_video_codec_params()
+                    + output_args,
+                    "граф фильтров, текущий кодек",
+                ):
+                    return True
+                if self.export_config.gpu_config.gpu_codec is None:
+                    return False
+                return self._run_ffmpeg(
+                    build_cmd([]) + self._get_cpu_codec_params() + output_args,
+                    "граф фильтров, CPU libx264",
+                )
+
         except Exception as e:
-            print("Ошибка определения GPU - используем CPU", e)
-            self.export_config.gpu_config.gpu_codec = "libx264"
+            print(f"Ошибка экспорта через граф фильтров FFmpeg: {e}")
+            return False
 
-    def export_video(
+    @staticmethod
+    def _read_video_info(video_processor, video_path: str) -> dict:
+        """Открывает видео, читает его параметры и сразу освобождает захват"""
+        cap = video_processor.load_video(video_path)
+        try:
+            return video_processor.get_video_info(cap)
+        finally:
+            cap.release()
+
+    def _mix_speakers_audio(
+        self, meeting_config: MeetingConfig, max_duration: float
+    ) -> Optional[np.ndarray]:
+        """Извлечение и смешивание аудио обоих спикеров"""
+        print("Извлечение аудио...")
+        # Два независимых процесса FFmpeg: запускаем одновременно
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            (audio1, _), (audio2, _) = executor.map(
+                self.audio_processor.extract_audio,
+                (meeting_config.speaker1_path, meeting_config.speaker2_path),
+            )
+
+        if audio1 is None and audio2 is None:
+            return None
+
+        print("Смешивание аудио...")
+        return self.audio_processor.mix_audio(
+            audio1, audio2, self.audio_processor.sample_rate, max_duration
+        )
+
+    @staticmethod
+    def _run_ffmpeg(command: list, label: str) -> bool:
+        """Запуск FFmpeg с выводом stderr при ошибке"""
+        try:
+            completed = subprocess.run(
+                command,
+                check=True,
+                capture_output=True,
+                text=True,
+            )
+            if completed.stdout:
+                print(completed.stdout)
+            return True
+        except subprocess.CalledProcessError as ex:
+            print(f"FFmpeg ошибка на этапе {label}: code={ex.returncode}")
+            if ex.stderr:
+                print(ex.stderr)
+            return False
+
+    def _export_frame_by_frame(
         self, meeting_config: MeetingConfig, composition_engine: CompositionEngine
     ) -> bool:
-        """Экспорт готового видео"""
+        """Экспорт с покадровой композицией через OpenCV"""
         try:
             # Загружаем фон
             background = composition_engine.image_processor.load_image(
@@ -61,6 +506,8 @@ class ExportService:
             )
             if background is None:
                 return False
+            # Фон масштабируется один раз на весь экспорт, а не на каждом кадре
+            background = composition_engine.prepare_background(background)
 
             # Загружаем видео спикеров
             cap1 = composition_engine.video_processor.load_video(
@@ -87,21 +534,11 @@ class ExportService:
                 f"Создание видео: {max_frames} кадров, {output_fps} FPS, {max_duration:.2f} сек"
             )
 
-            # Извлекаем аудио
-            print("Извлечение аудио...")
-            audio1, _ = self.audio_processor.extract_audio(meeting_config.speaker1_path)
-            audio2, _ = self.audio_processor.extract_audio(meeting_config.speaker2_path)
-
-            # Смешиваем аудио
-            mixed_audio = None
-            if audio1 is not None or audio2 is not None:
-                print("Смешивание аудио...")
-                mixed_audio = self.audio_processor.mix_audio(
-                    audio1, audio2, 44100, max_duration
-                )
+            # Извлекаем и смешиваем аудио
+            mixed_audio = self._mix_speakers_audio(meeting_config, max_duration)
 
             # Создаем временное видео
-            temp_video = tempfile.mktemp(suffix=".mp4")
+            temp_video = tempfile.mktemp(suffix=".mp4", dir=TEMP_ROOT)
             success = self._create_video_frames(
                 composition_engine,
                 background,
@@ -209,27 +646,11 @@ class ExportService:
         self, temp_video: str, mixed_audio: Optional[np.ndarray], output_path: str
     ) -> bool:
         """Объединение видео и аудио с GPU→CPU фолбэком и расширенным логированием."""
-
-        def run_ffmpeg(command: list, label: str) -> bool:
-            try:
-                completed = subprocess.run(
-                    command,
-                    check=True,
-                    capture_output=True,
-                    text=True,
-                )
-                if completed.stdout:
-                    print(completed.stdout)
-                return True
-            except subprocess.CalledProcessError as ex:
-                print(f"FFmpeg ошибка на этапе {label}: code={ex.returncode}")
-                if ex.stderr:
-                    print(ex.stderr)
-                return False
+        run_ffmpeg = self._run_ffmpeg
 
         # Подготовка команд для варианта с аудио и без аудио
         if mixed_audio is not None:
-            temp_audio = tempfile.mktemp(suffix=".wav")
+            temp_audio = tempfile.mktemp(suffix=".wav", dir=TEMP_ROOT)
             self.audio_processor.save_audio(mixed_audio, temp_audio)
 
             # Текущие (возможно GPU) параметры
@@ -256,18 +677,7 @@ class ExportService:
 
             # Фолбэк на CPU libx264
             cpu_cmd = ["ffmpeg", "-i", temp_video, "-i", temp_audio]
-            cpu_cmd.extend(
-                [
-                    "-c:v",
-                    "libx264",
-                    "-preset",
-                    self.export_config.video_codec.preset,
-                    "-crf",
-                    str(self.export_config.video_codec.crf),
-                    "-b:v",
-                    self.export_config.video_codec.bitrate,
-                ]
-            )
+            cpu_cmd.extend(self._get_cpu_codec_params())
             cpu_cmd.extend(
                 [
                     "-c:a",
@@ -295,7 +705,7 @@ class ExportService:
             except OSError:
                 pass
             try:
-                os.rename(temp_video, output_path)
+                shutil.move(temp_video, output_path)
                 print("FFmpeg не смог объединить аудио. Видео сохранено без аудио")
                 return True
             except OSError:
@@ -312,23 +722,9 @@ class ExportService:
                 return True
 
             # Фолбэк на CPU libx264
-            cpu_cmd = [
-                "ffmpeg",
-                "-i",
-                temp_video,
-                "-c:v",
-                "libx264",
-                "-preset",
-                self.export_config.video_codec.preset,
-                "-crf",
-                str(self.export_config.video_codec.crf),
-                "-b:v",
-                self.export_config.video_codec.bitrate,
-                "-movflags",
-                "+faststart",
-                "-y",
-                output_path,
-            ]
+            cpu_cmd = ["ffmpeg", "-i", temp_video]
+            cpu_cmd.extend(self._get_cpu_codec_params())
+            cpu_cmd.extend(["-movflags", "+faststart", "-y", output_path])
 
             if run_ffmpeg(cpu_cmd, "CPU libx264 (без аудио)"):
                 print(
@@ -338,63 +734,52 @@ class ExportService:
 
             # Абсолютный фолбэк: просто переименовать временное видео
             try:
-                os.rename(temp_video, output_path)
+                shutil.move(temp_video, output_path)
                 print("FFmpeg не выполнился. Видео сохранено как есть (без аудио)")
                 return True
             except OSError:
                 return False
 
+    def _get_hwaccel_input_args(self) -> List[str]:
+        """
+        Параметры аппаратного декодирования для входных видео спикеров.
+
+        Используются только вместе с NVENC: декодирование идет на NVDEC, а кадры
+        выгружаются в память CPU, так как граф фильтров (scale/pad/overlay)
+        работает на CPU. Поэтому -hwaccel_output_format cuda не задается.
+        """
+        gpu_config = self.export_config.gpu_config
+        if gpu_config.hwaccel is None or gpu_config.gpu_codec not in (
+            "h264_nvenc",
+            "hevc_nvenc",
+        ):
+            return []
+        return ["-hwaccel", gpu_config.hwaccel]
+
     def _get_video_codec_params(self) -> list:
         """Получение параметров видео кодека"""
-        gpu_codec = self.export_config.gpu_config.gpu_codec
+        video_codec = self.export_config.video_codec
+        return list(
+            build_video_codec_args(
+                video_codec.codec,
+                self.export_config.gpu_config.gpu_codec,
+                video_codec.preset,
+                video_codec.crf,
+                video_codec.bitrate,
+                self.export_config.threads,
+            )
+        )
 
-        if gpu_codec == "h264_nvenc":
-            return [
-                "-c:v",
-                "h264_nvenc",
-                "-preset",
-                "fast",
-                "-rc",
-                "vbr",
-                "-cq",
-                str(self.export_config.video_codec.crf),
-                "-b:v",
-                self.export_config.video_codec.bitrate,
-                "-maxrate",
-                self.export_config.video_codec.bitrate,
-                "-bufsize",
-                str(int(self.export_config.video_codec.bitrate.replace("k", "")) * 2)
-                + "k",
-            ]
-        elif gpu_codec == "h264_qsv":
-            return [
-                "-c:v",
-                "h264_qsv",
-                "-preset",
-                "fast",
-                "-global_quality",
-                str(self.export_config.video_codec.crf),
-                "-b:v",
-                self.export_config.video_codec.bitrate,
-            ]
-        elif gpu_codec == "h264_vaapi":
-            return [
-                "-c:v",
-                "h264_vaapi",
-                "-qp",
-                str(self.export_config.video_codec.crf),
-                "-b:v",
-                self.export_config.video_codec.bitrate,
-            ]
-        else:
-            # CPU кодирование
-            return [
-                "-c:v",
-                self.export_config.video_codec.codec,
-                "-preset",
-                self.export_config.video_codec.preset,
-                "-crf",
-                str(self.export_config.video_codec.crf),
-                "-b:v",
-                self.export_config.video_codec.bitrate,
-            ]
+    def _get_cpu_codec_params(self) -> list:
+        """Параметры CPU фолбэка (libx264), если GPU кодирование не удалось"""
+        video_codec = self.export_config.video_codec
+        return list(
+            build_video_codec_args(
+                "libx264",
+                None,
+                video_codec.preset,
+                video_codec.crf,
+                video_codec.bitrate,
+                self.export_config.threads,
+            )
+        )
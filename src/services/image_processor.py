@@ -9,7 +9,7 @@ import numpy as np
 from PIL import Image, ImageDraw, ImageFont
 from typing import Optional, Tuple
 from ..models.speaker_config import SpeakerConfig
-import matplotlib.font_manager as fm
+from ..utils.fonts import find_font_path
 
 
 def get_text_size(
@@ -62,6 +62,42 @@ class ImageProcessor:
             print(f"Ошибка загрузки изображения {image_path}: {e}")
             return None
 
+    @staticmethod
+    def decode_image(data) -> Optional[np.ndarray]:
+        """
+        Декодирует изображение из буфера в памяти (bytes, memoryview) в формат
+        OpenCV (BGR numpy array), не записывая его на диск.
+
+        :param data: Содержимое файла изображения (например, UploadedFile.getbuffer()).
+        :return: Изображение в виде массива numpy (BGR), или None в случае ошибки.
+        """
+        try:
+            # np.frombuffer не копирует данные, а оборачивает исходный буфер
+            image = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+            if image is None:
+                raise ValueError("Не удалось декодировать изображение из памяти")
+            return image
+        except Exception as e:
+            print(f"Ошибка декодирования изображения: {e}")
+            return None
+
+    @staticmethod
+    def encode_jpeg(image: np.ndarray, quality: int = 85) -> Optional[bytes]:
+        """
+        Кодирует изображение в JPEG в памяти, без записи на диск.
+
+        :param image: Изображение (BGR numpy array).
+        :param quality: Качество JPEG (0-100).
+        :return: Байты JPEG или None в случае ошибки.
+        """
+        success, buffer = cv2.imencode(
+            ".jpg", image, [int(cv2.IMWRITE_JPEG_QUALITY), quality]
+        )
+        if not success:
+            print("Ошибка кодирования изображения в JPEG")
+            return None
+        return buffer.tobytes()
+
     def create_name_plate(
         self,
         name: str,
@@ -88,11 +124,9 @@ class ImageProcessor:
         :param font_family: Название шрифта
         :return: PIL.Image с плашкой
         """
-        # 1. Загружаем шрифт
+        # 1. Загружаем шрифт (путь берется из общего индекса шрифтов процесса)
         try:
-            font_path = fm.findSystemFonts(fontpaths=None, fontext="ttf")
-            font_paths = {ImageFont.truetype(f).getname()[0]: f for f in font_path}
-            path = font_paths.get(font_family, None)
+            path = find_font_path(font_family)
             if path:
                 font = ImageFont.truetype(path, font_size)
             else:
@@ -127,6 +161,67 @@ class ImageProcessor:
 
         return plate
 
+    @staticmethod
+    def create_name_plate_cv2(
+        name: str,
+        width: int,
+        font_size: int = 24,
+        font_color: Tuple[int, int, int] = (255, 255, 255),
+        bg_color: Tuple[int, int, int, int] = (0, 0, 0, 180),
+        border_color: Tuple[int, int, int] = (255, 255, 255),
+        border_width: int = 2,
+        padding: int = 10,
+    ) -> np.ndarray:
+        """
+        Создает плашку с именем средствами OpenCV, без PIL.
+
+        Используется встроенный шрифт Hershey: он поддерживает только ASCII,
+        поэтому для кириллицы и выбора TTF шрифта нужен create_name_plate.
+
+        :param name: Текст для плашки (ASCII)
+        :param width: Ширина плашки (обычно ширина окна спикера)
+        :param font_size: Высота текста в пикселях
+        :param font_color: Цвет текста (RGB)
+        :param bg_color: Цвет фона плашки (RGBA)
+        :param border_color: Цвет рамки (RGB)
+        :param border_width: Толщина рамки
+        :param padding: Внутренние отступы вокруг текста
+        :return: Плашка в формате BGRA numpy array
+        """
+        font = cv2.FONT_HERSHEY_SIMPLEX
+        thickness = max(1, font_size // 12)
+        scale = cv2.getFontScaleFromHeight(font, font_size, thickness)
+        (text_w, text_h), baseline = cv2.getTextSize(name, font, scale, thickness)
+
+        plate_height = text_h + baseline + 2 * padding
+
+        # 1. Фон (цвета OpenCV в порядке BGR)
+        plate = np.empty((plate_height, width, 4), dtype=np.uint8)
+        plate[:] = (bg_color[2], bg_color[1], bg_color[0], bg_color[3])
+
+        # 2. Рамка внутрь плашки, как у PIL ImageDraw.rectangle(width=...)
+        if border_width > 0:
+            border = (border_color[2], border_color[1], border_color[0], 255)
+            plate[:border_width, :] = border
+            plate[-border_width:, :] = border
+            plate[:, :border_width] = border
+            plate[:, -border_width:] = border
+
+        # 3. Текст по центру (org — левый нижний угол базовой линии)
+        text_x = (width - text_w) // 2
+        text_y = padding + text_h
+        cv2.putText(
+            plate,
+            name,
+            (text_x, text_y),
+            font,
+            scale,
+            (font_color[2], font_color[1], font_color[0], 255),
+            thickness,
+            cv2.LINE_AA,
+        )
+        return plate
+
     def _load_font(self) -> ImageFont.FreeTypeFont:
         """
         Загрузка шрифта по имени или пути из SpeakerConfig.
@@ -182,17 +277,14 @@ class ImageProcessor:
         if (
             overlay.shape[2] == 4
         ):  # Если наложение имеет 4 канала (BGRA) - работаем с прозрачностью
-            # BGR часть и альфа-канал, нормализованный и умноженный на общий коэффициент alpha
-            overlay_bgr = overlay[:, :, :3]
-            overlay_alpha = overlay[:, :, 3] / 255.0 * alpha
-
-            # Выполняем альфа-смешивание (alpha blending) по каждому из трех цветовых каналов
-            for c in range(3):
-                # Формула: (новое значение) = (альфа * наложение) + ((1 - альфа) * фон)
-                bg_roi[:, :, c] = (
-                    overlay_alpha * overlay_bgr[:, :, c]
-                    + (1 - overlay_alpha) * bg_roi[:, :, c]
-                ).astype(np.uint8)  # Преобразуем обратно в np.uint8
+            # Альфа-канал (H, W, 1), нормализованный и умноженный на общий коэффициент
+            # alpha; лишняя ось позволяет смешать все три канала одной операцией.
+            overlay_alpha = overlay[:, :, 3:] * np.float32(alpha / 255.0)
+
+            # Формула: (новое значение) = (альфа * наложение) + ((1 - альфа) * фон)
+            bg_roi[:] = (
+                overlay_alpha * overlay[:, :, :3] + (1 - overlay_alpha) * bg_roi
+            ).astype(np.uint8)  # Преобразуем обратно в np.uint8
         else:  # Если наложение имеет 3 канала (BGR) - простое смешивание
             # Используем cv2.addWeighted для смешивания с заданным весом alpha
             bg_roi[:] = cv2.addWeighted(bg_roi, 1 - alpha, overlay, alpha, 0)
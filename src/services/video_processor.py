@@ -6,6 +6,7 @@
 
 import cv2
 import numpy as np
+from typing import Optional
 from ..models.export_config import ExportConfig
 
 
@@ -45,6 +46,28 @@ class VideoProcessor:
 
         return cap
 
+    @classmethod
+    def grab_frame(cls, video_path: str, t_sec: float = 0.0) -> Optional[np.ndarray]:
+        """
+        Читает один кадр видео в заданный момент времени.
+
+        Для t_sec > 0 выполняется переход (seek) средствами FFmpeg внутри OpenCV,
+        поэтому предыдущие кадры не декодируются целиком в Python.
+
+        :param video_path: Полный путь к видео файлу.
+        :param t_sec: Момент времени в секундах (0 — первый кадр).
+        :return: Кадр (BGR numpy array) или None, если кадр не удалось прочитать.
+        :raises ValueError: Если файл не удалось открыть.
+        """
+        cap = cls.load_video(video_path)
+        try:
+            if t_sec > 0:
+                cap.set(cv2.CAP_PROP_POS_MSEC, t_sec * 1000)
+            ret, frame = cap.read()
+            return frame if ret else None
+        finally:
+            cap.release()
+
     @staticmethod
     def get_video_info(cap: cv2.VideoCapture) -> dict:
         """
@@ -69,9 +92,51 @@ class VideoProcessor:
             "duration": duration,
         }
 
+    @staticmethod
+    def select_interpolation(
+        src_width: int, src_height: int, dst_width: int, dst_height: int
+    ) -> int:
+        """
+        Выбирает метод интерполяции OpenCV по направлению масштабирования.
+
+        Для уменьшения INTER_AREA (усреднение по площади) быстрее и дает меньше
+        артефактов (муара и звона), для увеличения используется INTER_LINEAR.
+
+        :param src_width: Ширина исходного изображения.
+        :param src_height: Высота исходного изображения.
+        :param dst_width: Ширина результата.
+        :param dst_height: Высота результата.
+        :return: Флаг интерполяции cv2.INTER_*.
+        """
+        if dst_width * dst_height < src_width * src_height:
+            return cv2.INTER_AREA
+        return cv2.INTER_LINEAR
+
+    @staticmethod
+    def resize_frame(image: np.ndarray, width: int, height: int) -> np.ndarray:
+        """
+        Изменяет размер изображения до заданного без сохранения пропорций
+        (фон растягивается на весь кадр).
+
+        :param image: Исходное изображение.
+        :param width: Ширина результата.
+        :param height: Высота результата.
+        :return: Новое изображение размером (height, width).
+        """
+        return cv2.resize(
+            image,
+            (width, height),
+            interpolation=VideoProcessor.select_interpolation(
+                image.shape[1], image.shape[0], width, height
+            ),
+        )
+
     @staticmethod
     def resize_with_aspect_ratio(
-        image: np.ndarray, target_width: int, target_height: int
+        image: np.ndarray,
+        target_width: int,
+        target_height: int,
+        dst: Optional[np.ndarray] = None,
     ) -> np.ndarray:
         """
         Изменяет размер изображения с сохранением пропорций (letterboxing).
@@ -83,6 +148,9 @@ class VideoProcessor:
         :param image: Исходное изображение (кадр) в виде np.ndarray.
         :param target_width: Желаемая ширина выходного кадра.
         :param target_height: Желаемая высота выходного кадра.
+        :param dst: Необязательный массив (target_height, target_width, 3), например
+                    ROI итогового кадра. Результат записывается прямо в него,
+                    без промежуточных массивов.
         :return: Измененное изображение с черными полосами, если необходимо.
         """
         h, w = image.shape[:2]
@@ -98,21 +166,33 @@ class VideoProcessor:
             new_width = target_width
             new_height = int(target_width / aspect_ratio)
 
-        # Выполняем масштабирование. INTER_LANCZOS4 обеспечивает высокое качество.
-        resized = cv2.resize(
-            image, (new_width, new_height), interpolation=cv2.INTER_LANCZOS4
-        )
-
-        # 2. Создание черного "холста" (background)
-        result = np.zeros((target_height, target_width, 3), dtype=np.uint8)
+        # 2. Черный "холст": переданный dst или новый массив
+        if dst is None:
+            result = np.zeros((target_height, target_width, 3), dtype=np.uint8)
+        else:
+            result = dst
 
         # 3. Центрирование масштабированного изображения на холсте
         y_offset = (target_height - new_height) // 2
         x_offset = (target_width - new_width) // 2
 
-        # Вставляем масштабированный кадр в центр
-        result[y_offset : y_offset + new_height, x_offset : x_offset + new_width] = (
-            resized
+        # Черные полосы закрашиваем только вокруг кадра (у нового холста они уже нулевые)
+        if dst is not None and (new_width, new_height) != (target_width, target_height):
+            result[:y_offset] = 0
+            result[y_offset + new_height :] = 0
+            result[:, :x_offset] = 0
+            result[:, x_offset + new_width :] = 0
+
+        # Масштабируем сразу в центр холста
+        cv2.resize(
+            image,
+            (new_width, new_height),
+            dst=result[
+                y_offset : y_offset + new_height, x_offset : x_offset + new_width
+            ],
+            interpolation=VideoProcessor.select_interpolation(
+                w, h, new_width, new_height
+            ),
         )
 
         return result
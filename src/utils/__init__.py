@@ -3,5 +3,7 @@
 """
 
 from .logger import setup_logger
+from .temp import TEMP_ROOT
+from .fonts import find_font_path, get_system_font_paths
 
-__all__ = ["setup_logger"]
+__all__ = ["setup_logger", "TEMP_ROOT", "find_font_path", "get_system_font_paths"]
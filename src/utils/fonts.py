@@ -0,0 +1,54 @@
+"""
+Утилиты для системных шрифтов: соответствие названия шрифта пути к файлу.
+Используется списком шрифтов в UI и отрисовкой плашек (PIL).
+"""
+
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+
+@lru_cache(maxsize=1)
+def get_system_font_paths() -> Dict[str, str]:
+    """
+    Строит соответствие «название шрифта → путь к TTF/OTF файлу» для шрифтов системы.
+
+    fontManager.ttflist уже содержит название и путь каждого шрифта (matplotlib
+    хранит его в fontlist-*.json), поэтому ни обход каталогов, ни открытие
+    каждого файла не нужны. Шрифты, поставляемые с самим matplotlib, в список
+    не входят. У семейства несколько файлов (Bold, Italic...), поэтому для
+    названия выбирается обычное начертание; другое берется, только если
+    обычного нет. Результат строится один раз на процесс.
+
+    :return: Словарь {название шрифта: путь к файлу}.
+    """
+    # Ленивый импорт: подсистема шрифтов matplotlib нужна только для плашек
+    import matplotlib
+    import matplotlib.font_manager as fm
+
+    def regular_face_rank(entry) -> Tuple[bool, int]:
+        # Обычное начертание с насыщенностью, ближайшей к 400 (Regular), идет
+        # первым. В старых кэшах matplotlib насыщенность хранится названием.
+        weight = entry.weight
+        if isinstance(weight, str):
+            weight = fm.weight_dict.get(weight, 400)
+        return entry.style != "normal", abs(weight - 400)
+
+    mpl_data_path = matplotlib.get_data_path()
+    best = {}
+    for entry in fm.fontManager.ttflist:
+        if entry.fname.startswith(mpl_data_path):
+            continue
+        current = best.get(entry.name)
+        if current is None or regular_face_rank(entry) < regular_face_rank(current):
+            best[entry.name] = entry
+    return {name: entry.fname for name, entry in best.items()}
+
+
+def find_font_path(font_name: str) -> Optional[str]:
+    """
+    Возвращает путь к файлу шрифта по его названию.
+
+    :param font_name: Название шрифта (например, "DejaVu Sans").
+    :return: Путь к файлу или None, если шрифт не установлен.
+    """
+    return get_system_font_paths().get(font_name)
@@ -0,0 +1,36 @@
+"""
+Утилиты для временных файлов: выбор каталога для промежуточных файлов
+(кадры, аудио, результат FFmpeg).
+"""
+
+import os
+import shutil
+from typing import Optional
+
+# Минимальный свободный объем tmpfs, при котором он используется для временных файлов.
+MIN_TMPFS_FREE_BYTES = 2 << 30  # 2 ГиБ
+
+
+def _find_temp_root() -> Optional[str]:
+    """
+    Возвращает /dev/shm, если он есть и в нем достаточно места, иначе None.
+
+    /dev/shm находится в памяти (tmpfs), поэтому промежуточные файлы FFmpeg
+    не пишутся на диск. В Docker /dev/shm по умолчанию 64 МБ — тогда
+    используется стандартный временный каталог.
+
+    :return: Путь к каталогу или None (стандартный каталог tempfile).
+    """
+    try:
+        if (
+            os.path.isdir("/dev/shm")
+            and shutil.disk_usage("/dev/shm").free > MIN_TMPFS_FREE_BYTES
+        ):
+            return "/dev/shm"
+    except OSError:
+        pass
+    return None
+
+
+# Каталог для промежуточных файлов (аргумент dir= для функций tempfile).
+TEMP_ROOT = _find_temp_root()